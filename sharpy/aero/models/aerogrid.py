@@ -19,6 +19,7 @@ import scipy.interpolate
 
 import sharpy.utils.algebra as algebra
 import sharpy.utils.cout_utils as cout
+import sharpy.aero.utils.mapping as mapping
 from sharpy.utils.datastructures import AeroTimeStepInfo
 import sharpy.utils.generator_interface as gen_interface
 
@@ -38,6 +39,7 @@ class Aerogrid(object):
         self.aero_dimensions_star = None
         self.airfoil_db = dict()
         self.struct2aero_mapping = None
+        self.struct2aero_mapping_flat = None
         self.aero2struct_mapping = []
 
         self.n_node = 0
@@ -381,6 +383,9 @@ class Aerogrid(object):
                         continue
                     self.aero2struct_mapping[i_surf][i_n] = i_global_node
 
+        # struct2aero_mapping as contiguous arrays (node_offsets, surf_idx, n_idx)
+        self.struct2aero_mapping_flat = mapping.flatten_struct2aero_mapping(self.struct2aero_mapping, self.n_node)
+
     def update_orientation(self, quat, ts=-1):
         rot = algebra.quat2rotation(quat)
         self.timestep_info[ts].update_orientation(rot.T)
@@ -1,6 +1,41 @@
 import numpy as np
 import sharpy.utils.algebra as algebra
 
+try:
+    from numba import njit
+    numba_available = True
+except ModuleNotFoundError:
+    numba_available = False
+
+
+def flatten_struct2aero_mapping(struct2aero_mapping, n_node):
+    """
+    Flattens the ``struct2aero_mapping`` (a list, per structural node, of dictionaries with keys ``i_surf`` and
+    ``i_n``) into contiguous integer arrays in compressed row format.
+
+    The aerodynamic sections linked to node ``i_global_node`` are given by the entries
+    ``node_offsets[i_global_node]`` to ``node_offsets[i_global_node + 1]`` of ``surf_idx`` and ``n_idx``.
+
+    Args:
+        struct2aero_mapping (list): Structural to aerodynamic node mapping.
+        n_node (int): Number of structural nodes.
+
+    Returns:
+        tuple: ``(node_offsets, surf_idx, n_idx)`` ``np.int32`` arrays.
+    """
+    node_offsets = np.zeros((n_node + 1,), dtype=np.int32)
+    for i_global_node in range(n_node):
+        node_offsets[i_global_node + 1] = node_offsets[i_global_node] + len(struct2aero_mapping[i_global_node])
+
+    surf_idx = np.zeros((node_offsets[-1],), dtype=np.int32)
+    n_idx = np.zeros((node_offsets[-1],), dtype=np.int32)
+    for i_global_node in range(n_node):
+        for k, mapping in enumerate(struct2aero_mapping[i_global_node]):
+            surf_idx[node_offsets[i_global_node] + k] = mapping['i_surf']
+            n_idx[node_offsets[i_global_node] + k] = mapping['i_n']
+
+    return node_offsets, surf_idx, n_idx
+
 
 def aero2struct_force_mapping(aero_forces,
                               struct2aero_mapping,
@@ -9,38 +44,75 @@ def aero2struct_force_mapping(aero_forces,
                               psi_def,
                               master,
                               conn,
-                              cag=np.eye(3)):
+                              cag=np.eye(3),
+                              struct2aero_mapping_flat=None):
 
     n_node, _ = pos_def.shape
     n_elem, _, _ = psi_def.shape
+
+    if struct2aero_mapping_flat is None:
+        struct2aero_mapping_flat = flatten_struct2aero_mapping(struct2aero_mapping, n_node)
+    node_offsets, surf_idx, n_idx = struct2aero_mapping_flat
+
+    if numba_available:
+        return _aero2struct_kernel(tuple(np.ascontiguousarray(forces, dtype=np.float64) for forces in aero_forces),
+                                   tuple(np.ascontiguousarray(zeta_surf, dtype=np.float64) for zeta_surf in zeta),
+                                   np.ascontiguousarray(pos_def, dtype=np.float64),
+                                   np.ascontiguousarray(psi_def, dtype=np.float64),
+                                   np.ascontiguousarray(conn, dtype=np.int64),
+                                   node_offsets,
+                                   surf_idx,
+                                   n_idx,
+                                   np.ascontiguousarray(cag, dtype=np.float64),
+                                   np.array_equal(cag, np.eye(3)))
+
     struct_forces = np.zeros((n_node, 6))
 
-    nodes = []
+    # rotation matrices of all element nodes, computed at once
+    cbg_all = algebra.crv2rotation_batch(psi_def.reshape((-1, 3))).transpose((0, 2, 1))
+    if not np.array_equal(cag, np.eye(3)):
+        cbg_all = np.matmul(cbg_all, cag)
+    # nodal positions in G frame (rows of cag.T @ pos_def.T)
+    pos_g = np.dot(pos_def, cag)
 
-    for i_elem in range(n_elem):
-        for i_local_node in range(3):
+    # resultant force and moment about the G origin of every spanwise section of every surface, stored contiguously
+    # with the sections of surface i_surf starting at column section_offsets[i_surf]
+    section_offsets = np.zeros((len(aero_forces) + 1,), dtype=np.int32)
+    section_forces = []
+    section_moments = []
+    for i_surf in range(len(aero_forces)):
+        _, n_m, n_n = aero_forces[i_surf].shape
+        section_offsets[i_surf + 1] = section_offsets[i_surf] + n_n
+        section_forces.append(aero_forces[i_surf][0:3].sum(axis=1))
+        section_moments.append(aero_forces[i_surf][3:6].sum(axis=1) +
+                               np.cross(zeta[i_surf][:, :n_m, :], aero_forces[i_surf][0:3], axis=0).sum(axis=1))
+    section_forces = np.concatenate(section_forces, axis=1)
+    section_moments = np.concatenate(section_moments, axis=1)
 
-            i_global_node = conn[i_elem, i_local_node]
-            if i_global_node in nodes:
-                continue
+    # each node takes the rotation of the first element in which it appears
+    node_first_visit = np.full((n_node,), -1, dtype=np.int64)
+    conn_nodes, first_visit = np.unique(conn[:, 0:3].ravel(), return_index=True)
+    node_first_visit[conn_nodes] = first_visit
 
-            nodes.append(i_global_node)
-            for mapping in struct2aero_mapping[i_global_node]:
-                i_surf = mapping['i_surf']
-                i_n = mapping['i_n']
-                _, n_m, _ = aero_forces[i_surf].shape
+    # one contribution per entry of the flattened struct2aero mapping
+    contrib_node = np.repeat(np.arange(n_node), np.diff(node_offsets))
+    contrib_section = section_offsets[surf_idx] + n_idx
+    in_conn = node_first_visit[contrib_node] >= 0
+    contrib_node = contrib_node[in_conn]
+    contrib_section = contrib_section[in_conn]
 
-                # i_master_elem, master_elem_local_node = master[i_global_node, :]
+    # moments transported from the G origin to the nodes
+    forces_g = section_forces[:, contrib_section].T
+    moments_g = section_moments[:, contrib_section].T - np.cross(pos_g[contrib_node, :], forces_g)
 
-                crv = psi_def[i_elem, i_local_node, :]
-                cab = algebra.crv2rotation(crv)
-                cbg = np.dot(cab.T, cag)
+    cbg = cbg_all[node_first_visit[contrib_node]]
+    contrib_forces = np.einsum('kij,kj->ki', cbg, forces_g)
+    contrib_moments = np.einsum('kij,kj->ki', cbg, moments_g)
 
-                for i_m in range(n_m):
-                    chi_g = zeta[i_surf][:, i_m, i_n] - np.dot(cag.T, pos_def[i_global_node, :])
-                    struct_forces[i_global_node, 0:3] += np.dot(cbg, aero_forces[i_surf][0:3, i_m, i_n])
-                    struct_forces[i_global_node, 3:6] += np.dot(cbg, aero_forces[i_surf][3:6, i_m, i_n])
-                    struct_forces[i_global_node, 3:6] += np.dot(cbg, np.cross(chi_g, aero_forces[i_surf][0:3, i_m, i_n]))
+    # scatter-add the contributions onto the nodes
+    for i_dim in range(3):
+        struct_forces[:, i_dim] = np.bincount(contrib_node, weights=contrib_forces[:, i_dim], minlength=n_node)
+        struct_forces[:, 3 + i_dim] = np.bincount(contrib_node, weights=contrib_moments[:, i_dim], minlength=n_node)
 
     # for i_global_node in range(n_node):
         # for mapping in struct2aero_mapping[i_global_node]:
@@ -60,3 +132,109 @@ def aero2struct_force_mapping(aero_forces,
                 # struct_forces[i_global_node, 3:6] += np.dot(cbg, aero_forces[i_surf][3:6, i_m, i_n])
                 # struct_forces[i_global_node, 3:6] += np.dot(cbg, np.cross(chi_g, aero_forces[i_surf][0:3, i_m, i_n]))
     return struct_forces
+
+
+if numba_available:
+    @njit(cache=True, fastmath=True)
+    def _aero2struct_kernel(aero_forces, zeta, pos_def, psi_def, conn, node_offsets, surf_idx, n_idx, cag, cag_is_eye):
+        """
+        Compiled counterpart of :func:`aero2struct_force_mapping`.
+
+        The rotation matrix of each node is built in place from the Cartesian rotation vector (Rodrigues formula) and
+        the panel forces and moments are accumulated in the ``G`` frame, such that a single projection onto the ``B``
+        frame is required per aerodynamic section.
+        """
+        n_node = pos_def.shape[0]
+        n_elem = psi_def.shape[0]
+        struct_forces = np.zeros((n_node, 6))
+        visited = np.zeros((n_node,), dtype=np.bool_)
+        cbg = np.zeros((3, 3))
+
+        for i_elem in range(n_elem):
+            for i_local_node in range(3):
+                i_global_node = conn[i_elem, i_local_node]
+                if visited[i_global_node]:
+                    continue
+                visited[i_global_node] = True
+
+                if node_offsets[i_global_node] == node_offsets[i_global_node + 1]:
+                    continue
+
+                # cab = I + sin(psi)/psi * skew(psi) + (1 - cos(psi))/psi**2 * skew(psi)**2
+                p0 = psi_def[i_elem, i_local_node, 0]
+                p1 = psi_def[i_elem, i_local_node, 1]
+                p2 = psi_def[i_elem, i_local_node, 2]
+                norm2 = p0*p0 + p1*p1 + p2*p2
+                norm_psi = np.sqrt(norm2)
+                if norm_psi < 1e-15:
+                    a = 1.0
+                    b = 0.5
+                else:
+                    a = np.sin(norm_psi)/norm_psi
+                    b = (1.0 - np.cos(norm_psi))/norm2
+                cab00 = 1.0 + b*(p0*p0 - norm2)
+                cab01 = -a*p2 + b*p0*p1
+                cab02 = a*p1 + b*p0*p2
+                cab10 = a*p2 + b*p0*p1
+                cab11 = 1.0 + b*(p1*p1 - norm2)
+                cab12 = -a*p0 + b*p1*p2
+                cab20 = -a*p1 + b*p0*p2
+                cab21 = a*p0 + b*p1*p2
+                cab22 = 1.0 + b*(p2*p2 - norm2)
+
+                # cbg = cab.T @ cag
+                if cag_is_eye:
+                    cbg[0, 0] = cab00
+                    cbg[0, 1] = cab10
+                    cbg[0, 2] = cab20
+                    cbg[1, 0] = cab01
+                    cbg[1, 1] = cab11
+                    cbg[1, 2] = cab21
+                    cbg[2, 0] = cab02
+                    cbg[2, 1] = cab12
+                    cbg[2, 2] = cab22
+                else:
+                    for j in range(3):
+                        cbg[0, j] = cab00*cag[0, j] + cab10*cag[1, j] + cab20*cag[2, j]
+                        cbg[1, j] = cab01*cag[0, j] + cab11*cag[1, j] + cab21*cag[2, j]
+                        cbg[2, j] = cab02*cag[0, j] + cab12*cag[1, j] + cab22*cag[2, j]
+
+                # nodal position in G frame: cag.T @ pos_def
+                r0 = cag[0, 0]*pos_def[i_global_node, 0] + cag[1, 0]*pos_def[i_global_node, 1] + \
+                    cag[2, 0]*pos_def[i_global_node, 2]
+                r1 = cag[0, 1]*pos_def[i_global_node, 0] + cag[1, 1]*pos_def[i_global_node, 1] + \
+                    cag[2, 1]*pos_def[i_global_node, 2]
+                r2 = cag[0, 2]*pos_def[i_global_node, 0] + cag[1, 2]*pos_def[i_global_node, 1] + \
+                    cag[2, 2]*pos_def[i_global_node, 2]
+
+                for k in range(node_offsets[i_global_node], node_offsets[i_global_node + 1]):
+                    i_surf = surf_idx[k]
+                    i_n = n_idx[k]
+                    forces = aero_forces[i_surf]
+                    zeta_surf = zeta[i_surf]
+
+                    f0 = 0.0
+                    f1 = 0.0
+                    f2 = 0.0
+                    m0 = 0.0
+                    m1 = 0.0
+                    m2 = 0.0
+                    for i_m in range(forces.shape[1]):
+                        fx = forces[0, i_m, i_n]
+                        fy = forces[1, i_m, i_n]
+                        fz = forces[2, i_m, i_n]
+                        chi0 = zeta_surf[0, i_m, i_n] - r0
+                        chi1 = zeta_surf[1, i_m, i_n] - r1
+                        chi2 = zeta_surf[2, i_m, i_n] - r2
+                        f0 += fx
+                        f1 += fy
+                        f2 += fz
+                        m0 += forces[3, i_m, i_n] + chi1*fz - chi2*fy
+                        m1 += forces[4, i_m, i_n] + chi2*fx - chi0*fz
+                        m2 += forces[5, i_m, i_n] + chi0*fy - chi1*fx
+
+                    for i in range(3):
+                        struct_forces[i_global_node, i] += cbg[i, 0]*f0 + cbg[i, 1]*f1 + cbg[i, 2]*f2
+                        struct_forces[i_global_node, 3 + i] += cbg[i, 0]*m0 + cbg[i, 1]*m1 + cbg[i, 2]*m2
+
+        return struct_forces
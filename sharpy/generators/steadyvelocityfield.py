@@ -51,6 +51,7 @@ class SteadyVelocityField(generator_interface.BaseGenerator):
 
         self.u_inf = 0.
         self.u_inf_direction = None
+        self._u_vec = None
 
     def initialise(self, in_dict):
         self.in_dict = in_dict
@@ -59,12 +60,15 @@ class SteadyVelocityField(generator_interface.BaseGenerator):
         self.u_inf = self.in_dict['u_inf']
         self.u_inf_direction = self.in_dict['u_inf_direction']
 
+        # free stream velocity vector, shaped to broadcast over the (3, M, N) grid of each surface
+        self._u_vec = (np.asarray(self.u_inf, dtype=np.float64) *
+                       np.asarray(self.u_inf_direction, dtype=np.float64)).reshape((3, 1, 1))
+
     def generate(self, params, uext):
         zeta = params['zeta']
         override = params['override']
         for i_surf in range(len(zeta)):
             if override:
-                uext[i_surf].fill(0.0)
-            for i in range(zeta[i_surf].shape[1]):
-                for j in range(zeta[i_surf].shape[2]):
-                    uext[i_surf][:, i, j] += self.u_inf*self.u_inf_direction
+                np.copyto(uext[i_surf], self._u_vec)
+            else:
+                uext[i_surf] += self._u_vec
@@ -120,8 +120,7 @@ class AerogridPlot(BaseSolver):
             point_data_dim = (dims[0]+1)*(dims[1]+1)  # + (dims_star[0]+1)*(dims_star[1]+1)
             panel_data_dim = (dims[0])*(dims[1])  # + (dims_star[0])*(dims_star[1])
 
-            coords = np.zeros((point_data_dim, 3))
-            conn = []
+            conn = np.zeros((panel_data_dim, 4), dtype=int)
             panel_id = np.zeros((panel_data_dim,), dtype=int)
             panel_surf_id = np.zeros((panel_data_dim,), dtype=int)
             panel_gamma = np.zeros((panel_data_dim,))
@@ -134,17 +133,9 @@ class AerogridPlot(BaseSolver):
             u_inf = np.zeros((point_data_dim, 3))
             if self.settings['include_velocities']:
                 vel = np.zeros((point_data_dim, 3))
-            counter = -1
 
             # coordinates of corners
-            for i_n in range(dims[1]+1):
-                for i_m in range(dims[0]+1):
-                    counter += 1
-                    coords[counter, :] = self.data.aero.timestep_info[self.ts].zeta[i_surf][:, i_m, i_n]
-                    if self.settings['include_rbm']:
-                        coords[counter, :] += self.data.structure.timestep_info[self.ts].for_pos[0:3]
-                    if self.settings['include_forward_motion']:
-                        coords[counter, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
+            coords = self.corner_coordinates(self.data.aero.timestep_info[self.ts].zeta[i_surf], dims)
 
             with_incidence_angle = True
             try:
@@ -180,10 +171,10 @@ class AerogridPlot(BaseSolver):
                     else:
                         continue
 
-                    conn.append([node_counter + 0,
-                                 node_counter + 1,
-                                 node_counter + dims[0]+2,
-                                 node_counter + dims[0]+1])
+                    conn[counter, :] = [node_counter + 0,
+                                        node_counter + 1,
+                                        node_counter + dims[0]+2,
+                                        node_counter + dims[0]+1]
                     # cell data
                     normal[counter, :] = self.data.aero.timestep_info[self.ts].normals[i_surf][:, i_m, i_n]
                     panel_id[counter] = counter
@@ -233,6 +224,22 @@ class AerogridPlot(BaseSolver):
                 ug.point_data.get_array(6).name = 'velocity'
             write_data(ug, filename)
 
+    def corner_coordinates(self, zeta, dims):
+        """
+        Returns the ``((dims[0] + 1)*(dims[1] + 1), 3)`` array of corner coordinates of a lattice ``zeta`` of shape
+        ``(3, M + 1, N + 1)``, ordered with the chordwise index running fastest and including the rigid body and
+        forward motion if specified in the settings.
+        """
+        coords = np.empty((dims[1] + 1, dims[0] + 1, 3))
+        coords[:] = zeta[:, :dims[0] + 1, :dims[1] + 1].transpose((2, 1, 0))
+        coords = coords.reshape((-1, 3))
+        if self.settings['include_rbm']:
+            coords += self.data.structure.timestep_info[self.ts].for_pos[0:3]
+        if self.settings['include_forward_motion']:
+            coords[:, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
+
+        return coords
+
     def plot_wake(self):
         for i_surf in range(self.data.aero.timestep_info[self.ts].n_surf):
             filename = (self.wake_filename +
@@ -246,22 +253,13 @@ class AerogridPlot(BaseSolver):
             point_data_dim = (dims_star[0]+1)*(dims_star[1]+1)
             panel_data_dim = (dims_star[0])*(dims_star[1])
 
-            coords = np.zeros((point_data_dim, 3))
-            conn = []
+            conn = np.zeros((panel_data_dim, 4), dtype=int)
             panel_id = np.zeros((panel_data_dim,), dtype=int)
             panel_surf_id = np.zeros((panel_data_dim,), dtype=int)
             panel_gamma = np.zeros((panel_data_dim,))
-            counter = -1
             # rotation_mat = self.data.structure.timestep_info[self.ts].cga().T
             # coordinates of corners
-            for i_n in range(dims_star[1]+1):
-                for i_m in range(dims_star[0]+1):
-                    counter += 1
-                    coords[counter, :] = self.data.aero.timestep_info[self.ts].zeta_star[i_surf][:, i_m, i_n]
-                    if self.settings['include_rbm']:
-                        coords[counter, :] += self.data.structure.timestep_info[self.ts].for_pos[0:3]
-                    if self.settings['include_forward_motion']:
-                        coords[counter, 0] -= self.settings['dt'].value*self.ts*self.settings['u_inf'].value
+            coords = self.corner_coordinates(self.data.aero.timestep_info[self.ts].zeta_star[i_surf], dims_star)
 
             counter = -1
             node_counter = -1
@@ -275,10 +273,10 @@ class AerogridPlot(BaseSolver):
                     else:
                         continue
 
-                    conn.append([node_counter + 0,
-                                 node_counter + 1,
-                                 node_counter + dims_star[0]+2,
-                                 node_counter + dims_star[0]+1])
+                    conn[counter, :] = [node_counter + 0,
+                                        node_counter + 1,
+                                        node_counter + dims_star[0]+2,
+                                        node_counter + dims_star[0]+1]
                     panel_id[counter] = counter
                     panel_surf_id[counter] = i_surf
                     panel_gamma[counter] = self.data.aero.timestep_info[self.ts].gamma_star[i_surf][i_m, i_n]
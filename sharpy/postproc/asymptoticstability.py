@@ -2,6 +2,7 @@ import os
 import warnings as warn
 import numpy as np
 import scipy.linalg as sclalg
+import scipy.sparse.linalg as scsplalg
 import sharpy.utils.settings as settings
 from sharpy.utils.solver_interface import solver, BaseSolver, initialise_solver
 import sharpy.utils.h5utils as h5
@@ -27,6 +28,7 @@ class AsymptoticStability(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['folder'] = 'str'
     settings_default['folder'] = './output'
@@ -49,6 +51,12 @@ class AsymptoticStability(BaseSolver):
     settings_description['export_eigenvalues'] = 'Save eigenvalues and eigenvectors to file. '
                                                  # 'Details in :func:`AsymptoticStability.export_eigenvalues`'
 
+    settings_types['export_format'] = 'str'
+    settings_default['export_format'] = 'dat'
+    settings_description['export_format'] = 'Format of the eigenvalue and eigenvector files. ``dat``: text files, ' \
+                                            '``npy``: NumPy binary files, much faster to write for large systems'
+    settings_options['export_format'] = ['dat', 'npy']
+
     settings_types['display_root_locus'] = 'bool'
     settings_default['display_root_locus'] = False
     settings_description['display_root_locus'] = 'Show plot with eigenvalues on Argand diagram'
@@ -65,6 +73,15 @@ class AsymptoticStability(BaseSolver):
     settings_default['num_evals'] = 200
     settings_description['num_evals'] = 'Number of eigenvalues to retain.'
 
+    settings_types['eigensolver'] = 'str'
+    settings_default['eigensolver'] = 'dense'
+    settings_description['eigensolver'] = 'Eigenvalue solver. ``dense``: complete set of eigenvalues. ``arnoldi``: ' \
+                                          'only the ``num_evals`` eigenvalues of largest magnitude (discrete time) ' \
+                                          'or largest real part (continuous time) are computed with ARPACK, so the ' \
+                                          'eigenvalues, eigenvectors and root locus are truncated. Only used if no ' \
+                                          '``frequency_cutoff`` is given'
+    settings_options['eigensolver'] = ['dense', 'arnoldi']
+
     settings_types['postprocessors'] = 'list(str)'
     settings_default['postprocessors'] = list()
 
@@ -72,7 +89,7 @@ class AsymptoticStability(BaseSolver):
     settings_default['postprocessors_settings'] = dict()
 
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.settings = None
@@ -96,7 +113,7 @@ class AsymptoticStability(BaseSolver):
         else:
             self.settings = custom_settings
 
-        settings.to_custom_types(self.settings, self.settings_types, self.settings_default)
+        settings.to_custom_types(self.settings, self.settings_types, self.settings_default, self.settings_options)
 
         self.num_evals = self.settings['num_evals'].value
 
@@ -138,7 +155,7 @@ class AsymptoticStability(BaseSolver):
         else:
             ss = self.data.linear.ss
 
-        eigenvalues, eigenvectors = sclalg.eig(ss.A)
+        eigenvalues, eigenvectors = self.compute_eigenvalues(ss)
 
         # Convert DT eigenvalues into CT
         if ss.dt:
@@ -151,7 +168,7 @@ class AsymptoticStability(BaseSolver):
                     dt = ss.dt
             except AttributeError:
                 dt = ss.dt
-            eigenvalues = np.log(eigenvalues) / dt
+            eigenvalues = self.continuous_time_eigenvalues(eigenvalues, dt)
 
         self.num_evals = min(self.num_evals, len(eigenvalues))
 
@@ -167,7 +184,7 @@ class AsymptoticStability(BaseSolver):
             self.display_root_locus()
 
         # Under development
-        if self.settings['modes_to_plot'] is not []:
+        if len(self.settings['modes_to_plot']) > 0:
             warn.warn('Plotting modes is under development')
             self.plot_modes()
 
@@ -179,16 +196,85 @@ class AsymptoticStability(BaseSolver):
 
         return self.data
 
+    def compute_eigenvalues(self, ss):
+        """
+        Computes the eigenvalues and right eigenvectors of the state-space system ``ss``.
+
+        By default the complete set of eigenvalues is computed with a dense solver. If the ``eigensolver`` setting is
+        ``arnoldi`` and no frequency cutoff is specified, only ``num_evals`` eigenvalues are computed using an
+        iterative Arnoldi method: the largest in magnitude for discrete-time systems and those with the largest real
+        part for continuous-time systems. Any complex conjugate pair split by the Arnoldi solver is completed, and
+        all subsequent results (eigenvalues, eigenvectors, exported files and root locus) only contain these
+        eigenvalues. If the Arnoldi iteration does not converge the dense solver is used instead.
+
+        Args:
+            ss (sharpy.linear.src.libss.ss): State-space system
+
+        The eigenvectors are returned in Fortran (column-major) order, as given by LAPACK and ARPACK, which is
+        preserved when selecting and reordering columns in :func:`AsymptoticStability.sort_eigenvalues`.
+
+        Returns:
+            tuple: Eigenvalues and right eigenvectors of ``ss.A``
+        """
+
+        num_states = ss.A.shape[0]
+
+        eigenvalues = None
+        if self.settings['eigensolver'] == 'arnoldi' and self.frequency_cutoff == np.inf \
+                and self.num_evals < num_states - 1:
+            if ss.dt:
+                which = 'LM'
+            else:
+                which = 'LR'
+            try:
+                eigenvalues, eigenvectors = scsplalg.eigs(ss.A, k=self.num_evals, which=which)
+                eigenvalues, eigenvectors = self.complete_conjugate_pairs(eigenvalues, eigenvectors)
+            except scsplalg.ArpackNoConvergence:
+                cout.cout_wrap('Arnoldi iteration did not converge, computing the full set of eigenvalues', 3)
+
+        if eigenvalues is None:
+            eigenvalues, eigenvectors = sclalg.eig(np.array(ss.A, order='F'), overwrite_a=True, check_finite=False)
+
+        return eigenvalues, np.asfortranarray(eigenvectors)
+
+    @staticmethod
+    def complete_conjugate_pairs(eigenvalues, eigenvectors, rtol=1e-6):
+        """
+        Appends the conjugate of the complex eigenvalues (and eigenvectors) of a real matrix whose conjugate is not
+        already included, as is the case when a partial eigenvalue solver splits a complex conjugate pair.
+
+        Args:
+            eigenvalues (np.ndarray): Eigenvalues
+            eigenvectors (np.ndarray): Corresponding right eigenvectors
+            rtol (float): Relative tolerance to identify complex eigenvalues and their conjugates
+
+        Returns:
+            tuple: Eigenvalues and eigenvectors with complete conjugate pairs
+        """
+        tol = rtol * np.abs(eigenvalues)
+        complex_evals = np.where(np.abs(eigenvalues.imag) > tol)[0]
+        distance = np.abs(eigenvalues[:, None] - eigenvalues[None, complex_evals].conj())
+        missing = complex_evals[np.min(distance, axis=0) > tol[complex_evals]]
+
+        if len(missing) == 0:
+            return eigenvalues, eigenvectors
+
+        return np.concatenate((eigenvalues, eigenvalues[missing].conj())), \
+            np.concatenate((eigenvectors, eigenvectors[:, missing].conj()), axis=1)
+
     def export_eigenvalues(self, num_evals):
         """
         Saves a ``num_evals`` number of eigenvalues and eigenvectors to file. The files are saved in the output directoy
         and include:
 
-            * ``eigenvectors.dat``: ``(num_dof, num_evals)`` array of eigenvectors
+            * ``eigenvalues.dat``: ``(num_evals, 2)`` array of the real and imaginary parts of the eigenvalues
 
-            * ``eigenvalues_r.dat``: ``(num_evals, 1)`` array of the real part of the eigenvalues
+            * ``eigenvectors_r.dat``: ``(num_dof, num_evals)`` array of the real part of the eigenvectors
 
-            * ``eigenvalues_i.dat``: ``(num_evals, 1)`` array of the imaginary part of the eigenvalues.
+            * ``eigenvectors_i.dat``: ``(num_dof, num_evals)`` array of the imaginary part of the eigenvectors.
+
+        If the ``export_format`` setting is ``npy``, the complex arrays are instead saved in binary form to
+        ``eigenvalues.npy`` and ``eigenvectors.npy`` and can be loaded with ``np.load``.
 
         References:
             Loading and saving complex arrays:
@@ -202,9 +288,14 @@ class AsymptoticStability(BaseSolver):
 
         num_evals = min(num_evals, self.eigenvalues.shape[0])
 
+        if self.settings['export_format'] == 'npy':
+            np.save(stability_folder_path + '/eigenvalues.npy', self.eigenvalues[:num_evals])
+            np.save(stability_folder_path + '/eigenvectors.npy', self.eigenvectors[:, :num_evals])
+            return
+
         np.savetxt(stability_folder_path + '/eigenvalues.dat', self.eigenvalues[:num_evals].view(float).reshape(-1, 2))
-        np.savetxt(stability_folder_path + '/eigenvectors_r.dat', self.eigenvectors.real[:, :num_evals])
-        np.savetxt(stability_folder_path + '/eigenvectors_i.dat', self.eigenvectors.imag[:, :num_evals])
+        np.savetxt(stability_folder_path + '/eigenvectors_r.dat', self.eigenvectors[:, :num_evals].real)
+        np.savetxt(stability_folder_path + '/eigenvectors_i.dat', self.eigenvectors[:, :num_evals].imag)
 
     def print_eigenvalues(self):
         """
@@ -229,9 +320,10 @@ class AsymptoticStability(BaseSolver):
         for i in range(len(u_inf_vec)):
             ss_aeroelastic = self.data.linear.linear_system.update(u_inf_vec[i])
 
-            eigs, eigenvectors = sclalg.eig(ss_aeroelastic.A)
+            # only the eigenvalues are required, skip the computation of the eigenvectors
+            eigs = sclalg.eigvals(ss_aeroelastic.A, check_finite=False)
 
-            eigs, eigenvectors = self.sort_eigenvalues(eigs, eigenvectors)
+            eigs, _ = self.sort_eigenvalues(eigs, None)
 
             # Obtain dimensional time
             dt_dimensional = self.data.linear.linear_system.uvlm.sys.ScalingFacts['length'] / u_inf_vec[i] \
@@ -304,11 +396,6 @@ class AsymptoticStability(BaseSolver):
         Plot the aeroelastic mode shapes for the first ``n_modes_to_plot``
 
         """
-        try:
-            import matplotlib.pyplot as plt
-        except ModuleNotFoundError:
-            cout.cout_wrap('Could not plot in asymptoticstability beacuse there is no Matplotlib', 4)
-            return
         mode_shape_list = self.settings['modes_to_plot']
         for mode in mode_shape_list:
             # Scale mode
@@ -406,6 +493,28 @@ class AsymptoticStability(BaseSolver):
         x_struct = self.eigenvectors[uvlm.ss.states:, eig]
         return gamma, gamma_dot, gamma_star, x_struct
 
+    @staticmethod
+    def continuous_time_eigenvalues(eigenvalues, dt):
+        """
+        Converts discrete-time eigenvalues into continuous-time eigenvalues, ``log(eigenvalues) / dt``.
+
+        Zero DT eigenvalues map to CT eigenvalues at ``-inf``, which are discarded by
+        :func:`AsymptoticStability.sort_eigenvalues`.
+
+        Args:
+            eigenvalues (np.ndarray): Discrete-time eigenvalues
+            dt (float): Time step
+
+        Returns:
+            np.ndarray: Continuous-time eigenvalues
+        """
+        eigenvalues = eigenvalues.astype(complex)
+        nonzero = np.abs(eigenvalues) > 1e-300
+        eigenvalues[nonzero] = np.log(eigenvalues[nonzero]) / dt
+        eigenvalues[~nonzero] = -np.inf + 0j
+
+        return eigenvalues
+
     @staticmethod
     def sort_eigenvalues(eigenvalues, eigenvectors, frequency_cutoff=0):
         """
@@ -416,7 +525,7 @@ class AsymptoticStability(BaseSolver):
 
         Args:
             eigenvalues (np.ndarray): Continuous-time eigenvalues
-            eigenvectors (np.ndarray): Corresponding right eigenvectors
+            eigenvectors (np.ndarray): Corresponding right eigenvectors. If ``None``, only the eigenvalues are sorted.
             frequency_cutoff (float): Cutoff frequency for truncation ``[rad/s]``
 
         Returns:
@@ -428,13 +537,18 @@ class AsymptoticStability(BaseSolver):
 
         # Remove poles in the negative imaginary plane (Im(\lambda)<0)
         criteria_a = np.abs(np.imag(eigenvalues)) <= frequency_cutoff
+        # Remove non-finite eigenvalues (such as zero DT eigenvalues converted to CT)
+        criteria_a &= np.isfinite(eigenvalues)
         # criteria_b = np.imag(eigenvalues) > -1e-2
-        eigenvalues_truncated = eigenvalues[criteria_a].copy()
-        eigenvectors_truncated = eigenvectors[:, criteria_a].copy()
+        retained = np.where(criteria_a)[0]
+
+        order = retained[np.argsort(eigenvalues[retained].real)[::-1]]
 
-        order = np.argsort(eigenvalues_truncated.real)[::-1]
+        if eigenvectors is None:
+            return eigenvalues[order], None
 
-        return eigenvalues_truncated[order], eigenvectors_truncated[:, order]
+        # single fancy index on the eigenvector columns, which already returns a copy
+        return eigenvalues[order], eigenvectors[:, order]
 
     @staticmethod
     def scale_rigid_body_mode(eigenvector, freq_d):
@@ -523,7 +523,8 @@ class DynamicCoupled(BaseSolver):
             structural_kstep.psi,
             self.data.structure.node_master_elem,
             self.data.structure.connectivities,
-            structural_kstep.cag())
+            structural_kstep.cag(),
+            struct2aero_mapping_flat=self.data.aero.struct2aero_mapping_flat)
         dynamic_struct_forces = unsteady_forces_coeff*mapping.aero2struct_force_mapping(
             aero_kstep.dynamic_forces,
             self.data.aero.struct2aero_mapping,
@@ -532,7 +533,8 @@ class DynamicCoupled(BaseSolver):
             structural_kstep.psi,
             self.data.structure.node_master_elem,
             self.data.structure.connectivities,
-            structural_kstep.cag())
+            structural_kstep.cag(),
+            struct2aero_mapping_flat=self.data.aero.struct2aero_mapping_flat)
 
         # prescribed forces + aero forces
         try:
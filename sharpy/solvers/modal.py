@@ -5,8 +5,10 @@
 import ctypes as ct
 import numpy as np
 import scipy as sc
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 import os
-import itertools
 import warnings
 import sharpy.structure.utils.xbeamlib as xbeamlib
 from sharpy.utils.solver_interface import solver, BaseSolver
@@ -32,6 +34,7 @@ class Modal(BaseSolver):
     settings_types = dict()
     settings_default = dict()
     settings_description = dict()
+    settings_options = dict()
 
     settings_types['print_info'] = 'bool'
     settings_default['print_info'] = True
@@ -54,6 +57,13 @@ class Modal(BaseSolver):
     settings_default['NumLambda'] = 20  # doubles if use_undamped_modes is False
     settings_description['NumLambda'] = 'Number of modes to retain'
 
+    settings_types['eigensolver'] = 'str'
+    settings_default['eigensolver'] = 'dense'
+    settings_description['eigensolver'] = 'Eigenvalue solver for the undamped modes of clamped structures. ' \
+                                          '``dense``: LAPACK generalised symmetric solver, ``lobpcg``: iterative ' \
+                                          'solver for the lowest ``NumLambda`` modes, faster for large systems'
+    settings_options['eigensolver'] = ['dense', 'lobpcg']
+
     settings_types['keep_linear_matrices'] = 'bool'  # attach linear M,C,K matrices to output dictionary
     settings_default['keep_linear_matrices'] = True
     settings_description['keep_linear_matrices'] = 'Save M, C and K matrices to output dictionary'
@@ -71,6 +81,12 @@ class Modal(BaseSolver):
     settings_default['write_dat'] = True
     settings_description['write_dat'] = 'Write mode shapes, frequencies and damping to file'
 
+    settings_types['output_format'] = 'str'
+    settings_default['output_format'] = 'dat'
+    settings_description['output_format'] = 'Format of the matrices and modal output files. ``dat``: text files, ' \
+                                            '``npy``: NumPy binary files, much faster to write for large systems'
+    settings_options['output_format'] = ['dat', 'npy']
+
     settings_types['continuous_eigenvalues'] = 'bool'
     settings_default['continuous_eigenvalues'] = False
     settings_description['continuous_eigenvalues'] = 'Use continuous time eigenvalues'
@@ -105,7 +121,7 @@ class Modal(BaseSolver):
     settings_description['rigid_modes_cg'] = 'Modify the ridid body modes such that they are defined wrt to the CG'
 
     settings_table = settings.SettingsTable()
-    __doc__ += settings_table.generate(settings_types, settings_default, settings_description)
+    __doc__ += settings_table.generate(settings_types, settings_default, settings_description, settings_options)
 
     def __init__(self):
         self.data = None
@@ -118,6 +134,8 @@ class Modal(BaseSolver):
         self.filename_shapes = None
         self.rigid_body_motion = None
 
+        self._buffers = dict()
+
     def initialise(self, data, custom_settings=None):
         self.data = data
         if custom_settings is None:
@@ -126,7 +144,8 @@ class Modal(BaseSolver):
             self.settings = custom_settings
         settings.to_custom_types(self.settings,
                                  self.settings_types,
-                                 self.settings_default)
+                                 self.settings_default,
+                                 self.settings_options)
 
         self.rigid_body_motion = self.settings['rigid_body_modes'].value
 
@@ -230,15 +249,10 @@ class Modal(BaseSolver):
 
         num_dof = num_str_dof + num_rigid_dof
 
-        # if NumLambda
+        use_undamped_modes = self.settings['use_undamped_modes'].value
+        eps = np.finfo(float).eps
 
-        # Initialize matrices
-        FullMglobal = np.zeros((num_dof, num_dof),
-                               dtype=ct.c_double, order='F')
-        FullKglobal = np.zeros((num_dof, num_dof),
-                               dtype=ct.c_double, order='F')
-        FullCglobal = np.zeros((num_dof, num_dof),
-                               dtype=ct.c_double, order='F')
+        # if NumLambda
 
         if self.rigid_body_motion:
             # Settings for the assembly of the matrices
@@ -258,12 +272,23 @@ class Modal(BaseSolver):
                                           self.data.structure.timestep_info[self.data.ts],
                                           full_matrix_settings)
         else:
+            # Initialize matrices (only required here, the free-flying assembly returns its own)
+            # the buffers can be reused in subsequent calls only if they are not kept in the output
+            reuse = not self.settings['keep_linear_matrices'].value
+            FullMglobal = self.zeros_buffer('M', num_dof, reuse)
+            FullKglobal = self.zeros_buffer('K', num_dof, reuse)
+            FullCglobal = self.zeros_buffer('C', num_dof, reuse)
+
             xbeamlib.cbeam3_solv_modal(self.data.structure,
                                        self.settings, self.data.ts,
                                        FullMglobal, FullCglobal, FullKglobal)
 
         # Print matrices
-        if self.settings['print_matrices'].value:
+        if self.settings['print_matrices'].value and self.settings['output_format'] == 'npy':
+            np.save(self.folder + "Mglobal.npy", FullMglobal)
+            np.save(self.folder + "Cglobal.npy", FullCglobal)
+            np.save(self.folder + "Kglobal.npy", FullKglobal)
+        elif self.settings['print_matrices'].value:
             np.savetxt(self.folder + "Mglobal.dat", FullMglobal, fmt='%.12f',
                        delimiter='\t', newline='\n')
             np.savetxt(self.folder + "Cglobal.dat", FullCglobal, fmt='%.12f',
@@ -272,13 +297,11 @@ class Modal(BaseSolver):
                        delimiter='\t', newline='\n')
 
         # Check if the damping matrix is zero (issue working)
-        if self.settings['use_undamped_modes'].value:
-            zero_FullCglobal = True
-            for i,j in itertools.product(range(num_dof),range(num_dof)):
-                if np.absolute(FullCglobal[i, j]) > np.finfo(float).eps:
-                    zero_FullCglobal = False
-                    warnings.warn('Projecting a system with damping on undamped modal shapes')
-                    break
+        if use_undamped_modes:
+            # boolean temporaries only, and the second scan is skipped if the first finds a nonzero entry
+            zero_FullCglobal = not (np.any(FullCglobal > eps) or np.any(FullCglobal < -eps))
+            if not zero_FullCglobal:
+                warnings.warn('Projecting a system with damping on undamped modal shapes')
         # Check if the damping matrix is skew-symmetric
         # skewsymmetric_FullCglobal = True
         # for i in range(num_dof):
@@ -290,37 +313,35 @@ class Modal(BaseSolver):
 
         NumLambda = min(num_dof, self.settings['NumLambda'].value)
 
-        if self.settings['use_undamped_modes'].value:
+        if use_undamped_modes:
 
-            # Solve for eigenvalues (with unit eigenvectors)            
-            eigenvalues,eigenvectors=np.linalg.eig(
-                                       np.linalg.solve(FullMglobal,FullKglobal))
+            eigenvalues, eigenvectors, freq_natural = self.undamped_modes(FullKglobal, FullMglobal, NumLambda)
             eigenvectors_left=None
-            # Define vibration frequencies and damping
-            freq_natural = np.sqrt(eigenvalues)
-            order = np.argsort(freq_natural)[:NumLambda]
-            freq_natural = freq_natural[order]
-            #freq_damped = freq_natural
-            eigenvalues = eigenvalues[order]
-            eigenvectors = eigenvectors[:,order]
             damping = np.zeros((NumLambda,))
 
         else:
             # State-space model
-            Minv_neg = -np.linalg.inv(FullMglobal)
-            A = np.zeros((2*num_dof, 2*num_dof), dtype=ct.c_double, order='F')
-            A[:num_dof, num_dof:] = np.eye(num_dof)
-            A[num_dof:, :num_dof] = np.dot(Minv_neg, FullKglobal)
-            A[num_dof:, num_dof:] = np.dot(Minv_neg, FullCglobal)
+            # The mass matrix is factorised once and reused for M^-1 K, M^-1 C and the forces gain matrix. It is not
+            # symmetric when rigid body degrees of freedom are included, hence the LU rather than Cholesky factorisation
+            M_lu = sc.linalg.lu_factor(FullMglobal, check_finite=False)
+            A = self.zeros_buffer('A', 2*num_dof)
+            np.fill_diagonal(A[:num_dof, num_dof:], 1.)
+            np.negative(sc.linalg.lu_solve(M_lu, FullKglobal, check_finite=False), out=A[num_dof:, :num_dof])
+            np.negative(sc.linalg.lu_solve(M_lu, FullCglobal, check_finite=False), out=A[num_dof:, num_dof:])
 
             # Solve the eigenvalues problem
+            # A is not used afterwards, so LAPACK can work on it in place
             eigenvalues, eigenvectors_left, eigenvectors = \
-                sc.linalg.eig(A,left=True,right=True)
+                sc.linalg.eig(A, left=True, right=True, overwrite_a=True, check_finite=False)
             freq_natural = np.abs(eigenvalues)
             damping = np.zeros_like(freq_natural)
             iiflex = freq_natural > 1e-16*np.mean(freq_natural)  # Pick only structural modes
-            damping[iiflex] = -eigenvalues[iiflex].real/freq_natural[iiflex]
-            freq_damped = freq_natural * np.sqrt(1-damping**2)
+            np.divide(-eigenvalues.real, freq_natural, out=damping, where=iiflex)
+            # freq_natural * sqrt(1 - damping ** 2) evaluated in a single buffer
+            freq_damped = np.square(damping)
+            np.subtract(1., freq_damped, out=freq_damped)
+            np.sqrt(freq_damped, out=freq_damped)
+            freq_damped *= freq_natural
 
             # Order & downselect complex conj:
             # this algorithm assumes that complex conj eigenvalues appear consecutively 
@@ -336,7 +357,7 @@ class Modal(BaseSolver):
 
             include = np.ones((2*NumLambda,), dtype=np.bool)
             ii = 0
-            tol_rel = np.finfo(float).eps * freq_damped[ii]
+            tol_rel = eps * freq_damped[ii]
             while ii < 2*NumLambda:
                 # check complex
                 if np.abs(eigenvalues[ii].imag) > 0.:
@@ -372,14 +393,15 @@ class Modal(BaseSolver):
         # Other terms required for state-space realisation
         # non-zero damping matrix
         # Modal damping matrix
-        if self.settings['use_undamped_modes'] and not(zero_FullCglobal):
+        if use_undamped_modes and not(zero_FullCglobal):
             Ccut = np.dot(eigenvectors.T, np.dot(FullCglobal, eigenvectors))
         else:
             Ccut = None
 
         # forces gain matrix (nodal -> modal)
-        if not self.settings['use_undamped_modes']:
-            Kin_damp = np.dot(eigenvectors_left[num_dof:, :].T, -Minv_neg)
+        if not use_undamped_modes:
+            # Phi_L^T M^-1 = (M^-T Phi_L)^T
+            Kin_damp = sc.linalg.lu_solve(M_lu, eigenvectors_left[num_dof:, :], trans=1, check_finite=False).T
         else:
             Kin_damp = None
 
@@ -396,24 +418,11 @@ class Modal(BaseSolver):
 
         # Write dat files
         if self.settings['write_dat'].value:
-            if type(eigenvalues) == complex:
-                np.savetxt(self.folder + "eigenvalues.dat", eigenvalues.view(float).reshape(-1, 2), fmt='%.12f',
-                           delimiter='\t', newline='\n')
-            else:
-                np.savetxt(self.folder + "eigenvalues.dat", eigenvalues.view(float), fmt='%.12f',
-                           delimiter='\t', newline='\n')
-            np.savetxt(self.folder + "eigenvectors.dat", eigenvectors[:num_dof].real,
-                       fmt='%.12f', delimiter='\t', newline='\n')
-
-            if not self.settings['use_undamped_modes'].value:
-                np.savetxt(self.folder + 'frequencies.dat', freq_damped[:NumLambda],
-                           fmt='%e', delimiter='\t', newline='\n')
+            if use_undamped_modes:
+                frequencies = freq_natural
             else:
-                np.savetxt(self.folder + 'frequencies.dat', freq_natural[:NumLambda],
-                           fmt='%e', delimiter='\t', newline='\n')
-
-            np.savetxt(self.filename_damp, damping[:NumLambda],
-                       fmt='%e', delimiter='\t', newline='\n')
+                frequencies = freq_damped
+            self.write_dat_files(eigenvalues, eigenvectors[:num_dof], frequencies[:NumLambda], damping[:NumLambda])
 
         # Write vtk
         if self.settings['write_modes_vtk'].value:
@@ -436,7 +445,7 @@ class Modal(BaseSolver):
 
         outdict = dict()
 
-        if self.settings['use_undamped_modes']:
+        if use_undamped_modes:
             outdict['modes'] = 'undamped'
             outdict['freq_natural'] = freq_natural
             if not zero_FullCglobal:
@@ -455,7 +464,7 @@ class Modal(BaseSolver):
             outdict['Ccut'] = Ccut
         if Kin_damp is not None:
             outdict['Kin_damp'] = Kin_damp
-        if not self.settings['use_undamped_modes']:    
+        if not use_undamped_modes:    
             outdict['eigenvectors_left'] = eigenvectors_left
 
         if self.settings['keep_linear_matrices'].value:
@@ -465,25 +474,223 @@ class Modal(BaseSolver):
         self.data.structure.timestep_info[self.data.ts].modal = outdict
 
         if self.settings['print_info']:
-            if self.settings['use_undamped_modes']:
+            if use_undamped_modes:
                 self.eigenvalue_table.print_evals(np.sqrt(eigenvalues[:NumLambda])*1j)
             else:
                 self.eigenvalue_table.print_evals(eigenvalues[:NumLambda])
 
         return self.data
 
+    def write_dat_files(self, eigenvalues, eigenvectors, frequencies, damping):
+        """
+        Writes the eigenvalues, mode shapes, frequencies and damping ratios to the output folder, as text or NumPy
+        binary files depending on the ``output_format`` setting.
+
+        Args:
+            eigenvalues (np.ndarray): Eigenvalues
+            eigenvectors (np.ndarray): Mode shapes, of which the real part is written
+            frequencies (np.ndarray): Natural (undamped modes) or damped frequencies
+            damping (np.ndarray): Damping ratios
+        """
+        if self.settings['output_format'] == 'npy':
+            np.save(self.folder + "eigenvalues.npy", eigenvalues)
+            np.save(self.folder + "eigenvectors.npy", eigenvectors.real)
+            np.save(self.folder + 'frequencies.npy', frequencies)
+            np.save(self.folder + 'tstep' + ("%06d" % self.data.ts) + '_ModalDamping.npy', damping)
+        else:
+            if type(eigenvalues) == complex:
+                np.savetxt(self.folder + "eigenvalues.dat", eigenvalues.view(float).reshape(-1, 2), fmt='%.12f',
+                           delimiter='\t', newline='\n')
+            else:
+                np.savetxt(self.folder + "eigenvalues.dat", eigenvalues.view(float), fmt='%.12f',
+                           delimiter='\t', newline='\n')
+            np.savetxt(self.folder + "eigenvectors.dat", eigenvectors.real,
+                       fmt='%.12f', delimiter='\t', newline='\n')
+            np.savetxt(self.folder + 'frequencies.dat', frequencies,
+                       fmt='%e', delimiter='\t', newline='\n')
+            np.savetxt(self.filename_damp, damping,
+                       fmt='%e', delimiter='\t', newline='\n')
+
+    def undamped_modes(self, FullKglobal, FullMglobal, NumLambda):
+        r"""
+        Computes the lowest ``NumLambda`` undamped modes of the structure.
+
+        For a clamped structure with symmetric mass and stiffness matrices, the generalised symmetric eigenvalue
+        problem is solved, otherwise the eigenvalues of :math:`\mathbf{M}^{-1}\mathbf{K}` are computed with the general
+        solver. The matrices are taken as symmetric if the largest asymmetric entry is below ``1e3`` times the machine
+        precision relative to the largest entry, such that slightly non-symmetric tangent stiffness matrices are
+        solved exactly rather than symmetrised.
+
+        Args:
+            FullKglobal (np.ndarray): Stiffness matrix
+            FullMglobal (np.ndarray): Mass matrix
+            NumLambda (int): Number of modes
+
+        Returns:
+            tuple: Eigenvalues, eigenvectors and natural frequencies
+        """
+        if not self.rigid_body_motion and self.is_symmetric(FullMglobal) and self.is_symmetric(FullKglobal):
+            # Generalised symmetric eigenvalue problem: only the lowest NumLambda real eigenvalues are
+            # computed, in ascending order
+            if self.settings['eigensolver'] == 'lobpcg':
+                eigenvalues, eigenvectors = self.lobpcg_modes(FullKglobal, FullMglobal, NumLambda)
+            else:
+                eigenvalues, eigenvectors = self.dense_modes(FullKglobal, FullMglobal, NumLambda)
+            # guard against round-off negative eigenvalues
+            freq_natural = np.sqrt(np.maximum(eigenvalues, 0.))
+        else:
+            # Solve for eigenvalues (with unit eigenvectors)
+            # M^-1 K is a new array that can be overwritten by the eigenvalue solver
+            eigenvalues, eigenvectors = sc.linalg.eig(
+                sc.linalg.solve(FullMglobal, FullKglobal, check_finite=False),
+                overwrite_a=True, check_finite=False)
+            # scipy always returns complex eigenvalues: keep them real for a real spectrum, as np.linalg.eig does
+            if not np.any(eigenvalues.imag):
+                eigenvalues = eigenvalues.real
+            # Define vibration frequencies and damping
+            freq_natural = np.sqrt(eigenvalues)
+            order = np.argsort(freq_natural)[:NumLambda]
+            freq_natural = freq_natural[order]
+            #freq_damped = freq_natural
+            eigenvalues = eigenvalues[order]
+            eigenvectors = eigenvectors[:,order]
+
+        return eigenvalues, eigenvectors, freq_natural
+
+    @staticmethod
+    def is_symmetric(matrix, rtol=1e3 * np.finfo(float).eps):
+        """
+        Checks whether ``matrix`` is symmetric to within ``rtol`` times its largest entry.
+
+        Args:
+            matrix (np.ndarray): Square matrix
+            rtol (float): Relative tolerance
+
+        Returns:
+            bool: ``True`` if the matrix is symmetric
+        """
+        return np.max(np.abs(matrix - matrix.T)) <= rtol * np.max(np.abs(matrix))
+
+    @staticmethod
+    def dense_modes(K, M, num_modes):
+        r"""
+        Computes the lowest ``num_modes`` eigenvalues and eigenvectors of the generalised symmetric eigenvalue problem
+        :math:`\mathbf{K\,\Phi} = \mathbf{M\,\Phi\,\Lambda}` using the dense LAPACK solver.
+
+        The subset of eigenvalues is selected with ``subset_by_index`` (SciPy >= 1.5) or with the older ``eigvals``
+        argument otherwise.
+
+        Args:
+            K (np.ndarray): Stiffness matrix
+            M (np.ndarray): Mass matrix
+            num_modes (int): Number of modes to compute
+
+        Returns:
+            tuple: Eigenvalues in ascending order and corresponding eigenvectors
+        """
+        try:
+            return sc.linalg.eigh(K, M, subset_by_index=[0, num_modes - 1])
+        except TypeError:
+            return sc.linalg.eigh(K, M, eigvals=(0, num_modes - 1))
+
+    @staticmethod
+    def lobpcg_modes(K, M, num_modes, tol=1e-8, maxiter=200):
+        r"""
+        Computes the lowest ``num_modes`` eigenvalues and eigenvectors of the generalised symmetric eigenvalue problem
+        :math:`\mathbf{K\,\Phi} = \mathbf{M\,\Phi\,\Lambda}` using the Locally Optimal Block Preconditioned Conjugate
+        Gradient method (LOBPCG).
+
+        The matrices are stored in sparse form since the beam matrices are banded, and the sparse factorisation of
+        :math:`\mathbf{K}` is used as preconditioner, so no dense factorisation is required. The convergence tolerance
+        is relative to :math:`\|\mathbf{K}\|_1/\sqrt{\|\mathbf{M}\|_1}`, the scale of the residual of an
+        :math:`\mathbf{M}`-normalised mode. If :math:`\mathbf{K}` is not positive definite or the residual of any mode
+        exceeds the tolerance, the dense solver is used instead.
+
+        Args:
+            K (np.ndarray): Stiffness matrix
+            M (np.ndarray): Mass matrix
+            num_modes (int): Number of modes to compute
+            tol (float): Relative solver tolerance
+            maxiter (int): Maximum number of iterations
+
+        Returns:
+            tuple: Eigenvalues in ascending order and corresponding eigenvectors
+        """
+        K_sparse = sc.sparse.csc_matrix(K)
+        M_sparse = sc.sparse.csc_matrix(M)
+
+        # symmetric ordering without row pivoting, such that K is positive definite if all the pivots are positive
+        try:
+            K_lu = sc.sparse.linalg.splu(K_sparse, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.,
+                                         options=dict(SymmetricMode=True))
+            positive_definite = np.array_equal(K_lu.perm_r, K_lu.perm_c) and np.all(K_lu.U.diagonal() > 0.)
+        except RuntimeError:  # singular
+            positive_definite = False
+        if not positive_definite:
+            cout.cout_wrap('Stiffness matrix not positive definite, using the dense eigenvalue solver', 3)
+            return Modal.dense_modes(K, M, num_modes)
+
+        preconditioner = sc.sparse.linalg.LinearOperator(K.shape, matvec=K_lu.solve, matmat=K_lu.solve,
+                                                         dtype=K.dtype)
+
+        residual_tol = tol * sc.sparse.linalg.norm(K_sparse, 1) / np.sqrt(sc.sparse.linalg.norm(M_sparse, 1))
+
+        # a few additional guard vectors speed up the convergence of the highest requested modes
+        num_vectors = min(K.shape[0], num_modes + max(5, num_modes // 2))
+        x0 = np.random.default_rng(0).standard_normal((K.shape[0], num_vectors))
+        with warnings.catch_warnings():
+            # non-convergence is detected from the residuals below
+            warnings.simplefilter('ignore', UserWarning)
+            eigenvalues, eigenvectors = sc.sparse.linalg.lobpcg(K_sparse, x0, B=M_sparse, M=preconditioner,
+                                                                largest=False, tol=residual_tol, maxiter=maxiter)
+        order = np.argsort(eigenvalues)[:num_modes]
+        eigenvalues = eigenvalues[order]
+        eigenvectors = eigenvectors[:, order]
+
+        # same criterion as LOBPCG, which only warns when not converged
+        residual = np.linalg.norm(K_sparse.dot(eigenvectors) - M_sparse.dot(eigenvectors) * eigenvalues, axis=0)
+        if np.any(residual > residual_tol):
+            cout.cout_wrap('LOBPCG did not converge, using the dense eigenvalue solver', 3)
+            return Modal.dense_modes(K, M, num_modes)
+
+        return eigenvalues, eigenvectors
+
+    def zeros_buffer(self, name, size, reuse=True):
+        """
+        Returns a zeroed ``(size, size)`` Fortran ordered array. If ``reuse``, the array named ``name`` is stored and
+        zeroed again in subsequent calls rather than allocating a new one, as long as its size does not change.
+
+        Args:
+            name (str): Buffer name
+            size (int): Number of rows and columns
+            reuse (bool): Store the buffer to be reused
+
+        Returns:
+            np.ndarray: Zeroed array
+        """
+        buffer = self._buffers.get(name)
+        if not reuse or buffer is None or buffer.shape[0] != size:
+            buffer = np.zeros((size, size), dtype=ct.c_double, order='F')
+            if reuse:
+                self._buffers[name] = buffer
+        else:
+            buffer.fill(0.)
+
+        return buffer
+
     def scale_modes_unit_mass_matrix(self, eigenvectors, FullMglobal, eigenvectors_left=None):
         if self.settings['use_undamped_modes']:
             # mass normalise (diagonalises M and K)
-            dfact = np.diag(np.dot(eigenvectors.T, np.dot(FullMglobal, eigenvectors)))
+            # only the diagonal of Phi^T M Phi is required
+            dfact = np.einsum('ij,ij->j', eigenvectors, np.dot(FullMglobal, eigenvectors))
             eigenvectors = (1./np.sqrt(dfact))*eigenvectors
         else:
             # unit normalise (diagonalises A)
             if not self.rigid_body_motion:
-                for ii in range(eigenvectors.shape[1]):  # Issue - dot product = 0 when you have arbitrary damping
-                    fact = 1./np.sqrt(np.dot(eigenvectors_left[:, ii], eigenvectors[:, ii]))
-                    eigenvectors_left[:, ii] = fact*eigenvectors_left[:, ii]
-                    eigenvectors[:, ii] = fact*eigenvectors[:, ii]
+                # Issue - dot product = 0 when you have arbitrary damping
+                fact = 1./np.sqrt(np.einsum('ij,ij->j', eigenvectors_left, eigenvectors))
+                eigenvectors_left *= fact
+                eigenvectors *= fact
 
         return eigenvectors, eigenvectors_left
 
@@ -1,20 +1,34 @@
+import functools
+import os
 import numpy as np
+from multiprocessing.pool import ThreadPool
 import sharpy.utils.cout_utils as cout
 import sharpy.utils.algebra as algebra
+import sharpy.aero.utils.mapping as mapping
 from tvtk.api import tvtk, write_data
 
+try:
+    from numba import njit, prange
+    numba_available = True
+except ModuleNotFoundError:
+    numba_available = False
+
 
 def frequency_damping(eigenvalue):
+    """
+    Natural and damped frequencies, damping ratio and period of an eigenvalue or of an array of eigenvalues.
+
+    Eigenvalues with a damped frequency below ``1e-8`` Hz are given a damping ratio of one and an infinite period.
+    """
+    eigenvalue = np.asarray(eigenvalue)
     omega_n = np.abs(eigenvalue)
     omega_d = np.abs(eigenvalue.imag)
     f_n = omega_n / 2 / np.pi
     f_d = omega_d / 2 / np.pi
-    if f_d < 1e-8:
-        damping_ratio = 1.
-        period = np.inf
-    else:
-        damping_ratio = -eigenvalue.real / omega_n
-        period = 1 / f_d
+    oscillatory = f_d >= 1e-8
+    with np.errstate(divide='ignore', invalid='ignore'):
+        damping_ratio = np.where(oscillatory, -eigenvalue.real / omega_n, 1.)[()]
+        period = np.where(oscillatory, 1 / f_d, np.inf)[()]
 
     return omega_n, omega_d, damping_ratio, f_n, f_d, period
 
@@ -27,10 +41,10 @@ class EigenvalueTable(cout.TablePrinter):
                         'damping', 'period (s)']
 
     def print_evals(self, eigenvalues):
+        omega_n, omega_d, damping_ratio, f_n, f_d, period = frequency_damping(eigenvalues)
         for i in range(len(eigenvalues)):
-            omega_n, omega_d, damping_ratio, f_n, f_d, period = frequency_damping(eigenvalues[i])
-            self.print_line([i, eigenvalues[i].real, eigenvalues[i].imag, f_n, f_d,
-                             damping_ratio, period])
+            self.print_line([i, eigenvalues[i].real, eigenvalues[i].imag, f_n[i], f_d[i],
+                             damping_ratio[i], period[i]])
 
 
 def cg(M):
@@ -55,37 +69,14 @@ def scale_mode(data, eigenvector, rot_max_deg=15, perc_max=0.15):
     struct = data.structure
     tsstr = data.structure.timestep_info[data.ts]
 
-    jj = 0  # structural dofs index
-    RotMax = 0.0
-    RaMax = 0.0
-    dRaMax = 0.0
-
-    for node_glob in range(struct.num_node):
-        ### detect bc at node (and no. of dofs)
-        bc_here = struct.boundary_conditions[node_glob]
-        if bc_here == 1:  # clamp
-            dofs_here = 0
-            continue
-        elif bc_here == -1 or bc_here == 0:
-            dofs_here = 6
-            jj_tra = [jj, jj + 1, jj + 2]
-            jj_rot = [jj + 3, jj + 4, jj + 5]
-        jj += dofs_here
-
-        # check for max rotation
-        RotMaxHere = np.max(np.abs(eigenvector[jj_rot].real))
-        if RotMaxHere > RotMax:
-            RotMax = RotMaxHere
-
-        # check for maximum position
-        RaNorm = np.linalg.norm(tsstr.pos[node_glob, :])
-        if RaNorm > RaMax:
-            RaMax = RaNorm
+    # clamped nodes have no dofs, the remaining nodes have 6 dofs each in order of appearance
+    free_nodes = np.where(struct.boundary_conditions != 1)[0]
+    eigvec_free = eigenvector[:6 * len(free_nodes)].real.reshape((-1, 6))
 
-        # check for maximum displacement
-        dRaNorm = np.linalg.norm(eigenvector[jj_tra].real)
-        if dRaNorm > dRaMax:
-            dRaMax = dRaNorm
+    # max rotation, position and displacement
+    RotMax = np.max(np.abs(eigvec_free[:, 3:6]), initial=0.)
+    RaMax = np.max(np.linalg.norm(tsstr.pos[free_nodes, :], axis=1), initial=0.)
+    dRaMax = np.max(np.linalg.norm(eigvec_free[:, 0:3], axis=1), initial=0.)
 
     RotMaxDeg = RotMax * 180 / np.pi
 
@@ -102,6 +93,8 @@ def scale_mode(data, eigenvector, rot_max_deg=15, perc_max=0.15):
 def get_mode_zeta(data, eigvect):
     """
     Retrieves the UVLM grid nodal displacements associated to the eigenvector ``eigvect``
+
+    If Numba is available and ``eigvect`` is real, the node loop is run in the compiled :func:`_mode_zeta_kernel`.
     """
 
     ### initialise
@@ -117,67 +110,284 @@ def get_mode_zeta(data, eigvect):
 
     eigvect = eigvect[:num_dof]
 
+    # local references to the arrays accessed in the node loop
+    boundary_conditions = struct.boundary_conditions
+    node_master_elem = struct.node_master_elem
+    pos = tsstr.pos
+    psi_def = tsstr.psi
+    zeta = tsaero.zeta
+
     zeta_mode = []
     for ss in range(aero.n_surf):
-        zeta_mode.append(tsaero.zeta[ss].copy())
+        zeta_mode.append(zeta[ss].copy())
 
-    jj = 0  # structural dofs index
     Cga0 = algebra.quat2rotation(tsstr.quat)
+
+    # flattened struct2aero mapping, computed once and stored in the aerodynamic grid if not already there
+    struct2aero_mapping_flat = getattr(aero, 'struct2aero_mapping_flat', None)
+    if struct2aero_mapping_flat is None:
+        struct2aero_mapping_flat = mapping.flatten_struct2aero_mapping(aero.struct2aero_mapping, struct.num_node)
+        aero.struct2aero_mapping_flat = struct2aero_mapping_flat
+    node_offsets, surf_idx, n_idx = struct2aero_mapping_flat
+
+    if numba_available and np.isrealobj(eigvect):
+        zeta_mode = [np.ascontiguousarray(zeta_surf, dtype=np.float64) for zeta_surf in zeta_mode]
+        _mode_zeta_kernel(np.ascontiguousarray(eigvect, dtype=np.float64),
+                          np.ascontiguousarray(pos, dtype=np.float64),
+                          np.ascontiguousarray(psi_def, dtype=np.float64),
+                          Cga0,
+                          np.ascontiguousarray(boundary_conditions, dtype=np.int64),
+                          np.ascontiguousarray(node_master_elem, dtype=np.int64),
+                          node_offsets,
+                          surf_idx,
+                          n_idx,
+                          tuple(np.ascontiguousarray(zeta_surf, dtype=np.float64) for zeta_surf in zeta),
+                          tuple(zeta_mode))
+        return zeta_mode
+
+    jj = 0  # structural dofs index
     Cag0 = Cga0.T
     for node_glob in range(struct.num_node):
 
         ### detect bc at node (and no. of dofs)
-        bc_here = struct.boundary_conditions[node_glob]
+        bc_here = boundary_conditions[node_glob]
         if bc_here == 1:  # clamp
             dofs_here = 0
             continue
         elif bc_here == -1 or bc_here == 0:
             dofs_here = 6
-            jj_tra = [jj, jj + 1, jj + 2]
-            jj_rot = [jj + 3, jj + 4, jj + 5]
+            jj_tra = slice(jj, jj + 3)
+            jj_rot = slice(jj + 3, jj + 6)
         jj += dofs_here
 
         # retrieve element and local index
-        ee, node_loc = struct.node_master_elem[node_glob, :]
+        ee, node_loc = node_master_elem[node_glob, :]
 
         # get original position and crv
-        Ra0 = tsstr.pos[node_glob, :]
-        psi0 = tsstr.psi[ee, node_loc, :]
+        Ra0 = pos[node_glob, :]
+        psi0 = psi_def[ee, node_loc, :]
         Rg0 = np.dot(Cga0, Ra0)
         Cab0 = algebra.crv2rotation(psi0)
         Cbg0 = np.dot(Cab0.T, Cag0)
 
         # update position and crv of mode
-        Ra = tsstr.pos[node_glob, :] + eigvect[jj_tra]
-        psi = tsstr.psi[ee, node_loc, :] + eigvect[jj_rot]
+        Ra = Ra0 + eigvect[jj_tra]
+        psi = psi0 + eigvect[jj_rot]
         Rg = np.dot(Cga0, Ra)
         Cab = algebra.crv2rotation(psi)
-        Cbg = np.dot(Cab.T, Cag0)
+        Cgb = np.dot(Cga0, Cab)
 
         ### str -> aero mapping
         # some nodes may be linked to multiple surfaces...
-        for str2aero_here in aero.struct2aero_mapping[node_glob]:
+        for k in range(node_offsets[node_glob], node_offsets[node_glob + 1]):
 
             # detect surface/span-wise coordinate (ss,nn)
-            nn, ss = str2aero_here['i_n'], str2aero_here['i_surf']
-            # print('%.2d,%.2d'%(nn,ss))
-
-            # surface panelling
-            M = aero.aero_dimensions[ss][0]
-            N = aero.aero_dimensions[ss][1]
+            nn, ss = n_idx[k], surf_idx[k]
 
-            for mm in range(M + 1):
-                # get position of vertex in B FoR
-                zetag0 = tsaero.zeta[ss][:, mm, nn]  # in G FoR, w.r.t. origin A-G
-                Xb = np.dot(Cbg0, zetag0 - Rg0)  # in B FoR, w.r.t. origin B
+            # get position of the chordwise vertices in B FoR
+            zetag0 = zeta[ss][:, :, nn]  # in G FoR, w.r.t. origin A-G
+            Xb = np.dot(Cbg0, zetag0 - Rg0[:, None])  # in B FoR, w.r.t. origin B
 
-                # update vertex position
-                zeta_mode[ss][:, mm, nn] = Rg + np.dot(np.dot(Cga0, Cab), Xb)
+            # update vertex positions
+            zeta_mode[ss][:, :, nn] = Rg[:, None] + np.dot(Cgb, Xb)
 
     return zeta_mode
 
 
-def write_zeta_vtk(zeta, zeta_ref, filename_root):
+if numba_available:
+    @njit(cache=True, nogil=True, inline='always')
+    def _crv2rotation(psi0, psi1, psi2, rot):
+        """
+        Compiled counterpart of :func:`sharpy.utils.algebra.crv2rotation` that writes the rotation matrix of the
+        Cartesian rotation vector ``(psi0, psi1, psi2)`` onto ``rot``.
+
+        The coefficients of the Rodrigues formula are written in terms of the normalised sinc function,
+        ``sin(psi)/psi = sinc(psi/pi)`` and ``(1 - cos(psi))/psi**2 = sinc(psi/(2 pi))**2/2``, which are well defined
+        for a zero rotation, so no small angle branch is required. The latter also avoids the cancellation in
+        ``1 - cos(psi)`` for small angles.
+        """
+        norm2 = psi0*psi0 + psi1*psi1 + psi2*psi2
+        norm_psi = np.sqrt(norm2)
+        a = np.sinc(norm_psi/np.pi)
+        b = 0.5*np.sinc(0.5*norm_psi/np.pi)**2
+        rot[0, 0] = 1.0 + b*(psi0*psi0 - norm2)
+        rot[0, 1] = -a*psi2 + b*psi0*psi1
+        rot[0, 2] = a*psi1 + b*psi0*psi2
+        rot[1, 0] = a*psi2 + b*psi0*psi1
+        rot[1, 1] = 1.0 + b*(psi1*psi1 - norm2)
+        rot[1, 2] = -a*psi0 + b*psi1*psi2
+        rot[2, 0] = -a*psi1 + b*psi0*psi2
+        rot[2, 1] = a*psi0 + b*psi1*psi2
+        rot[2, 2] = 1.0 + b*(psi2*psi2 - norm2)
+
+    @njit(cache=True, nogil=True)
+    def _mode_zeta_kernel(eigvect, pos, psi_def, cga0, boundary_conditions, node_master_elem,
+                          node_offsets, surf_idx, n_idx, zeta, zeta_mode):
+        """
+        Compiled counterpart of the node loop in :func:`get_mode_zeta`. The displaced lattice is written onto
+        ``zeta_mode``.
+
+        For each node, the vertices linked to it are rigidly moved with the nodal displacement and rotation, i.e.
+        ``zeta_mode = Rg + Cga0 Cab Cab0^T Cag0 (zeta - Rg0)``.
+        """
+        cab0 = np.zeros((3, 3))
+        cab = np.zeros((3, 3))
+        cgb = np.zeros((3, 3))
+        rot = np.zeros((3, 3))
+        rg0 = np.zeros((3,))
+        rg = np.zeros((3,))
+
+        jj = 0  # structural dofs index
+        for node_glob in range(pos.shape[0]):
+            if boundary_conditions[node_glob] == 1:  # clamp
+                continue
+
+            ee = node_master_elem[node_glob, 0]
+            node_loc = node_master_elem[node_glob, 1]
+
+            _crv2rotation(psi_def[ee, node_loc, 0],
+                          psi_def[ee, node_loc, 1],
+                          psi_def[ee, node_loc, 2], cab0)
+            _crv2rotation(psi_def[ee, node_loc, 0] + eigvect[jj + 3],
+                          psi_def[ee, node_loc, 1] + eigvect[jj + 4],
+                          psi_def[ee, node_loc, 2] + eigvect[jj + 5], cab)
+
+            for i in range(3):
+                rg0[i] = 0.
+                rg[i] = 0.
+                for j in range(3):
+                    rg0[i] += cga0[i, j]*pos[node_glob, j]
+                    rg[i] += cga0[i, j]*(pos[node_glob, j] + eigvect[jj + j])
+                    cgb[i, j] = cga0[i, 0]*cab[0, j] + cga0[i, 1]*cab[1, j] + cga0[i, 2]*cab[2, j]
+
+            # rot = cgb @ cab0.T @ cga0.T
+            for i in range(3):
+                for j in range(3):
+                    rot[i, j] = 0.
+                    for k in range(3):
+                        rot[i, j] += (cgb[i, 0]*cab0[k, 0] + cgb[i, 1]*cab0[k, 1] + cgb[i, 2]*cab0[k, 2])*cga0[j, k]
+
+            for k in range(node_offsets[node_glob], node_offsets[node_glob + 1]):
+                ss = surf_idx[k]
+                nn = n_idx[k]
+                for mm in range(zeta[ss].shape[1]):
+                    x0 = zeta[ss][0, mm, nn] - rg0[0]
+                    x1 = zeta[ss][1, mm, nn] - rg0[1]
+                    x2 = zeta[ss][2, mm, nn] - rg0[2]
+                    for i in range(3):
+                        zeta_mode[ss][i, mm, nn] = rg[i] + rot[i, 0]*x0 + rot[i, 1]*x1 + rot[i, 2]*x2
+
+            jj += 6
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_arange(n):
+    """
+    ``np.arange(n)`` as ``np.int32``, shared between calls with the same ``n``, e.g. surfaces of equal size or
+    successive mode shapes. The returned array is read only.
+    """
+    arr = np.arange(n, dtype=np.int32)
+    arr.setflags(write=False)
+    return arr
+
+
+def _zeta_vtk_arrays(zeta_surf, zeta_ref_surf, i_surf, aero2struct_mapping_surf=None):
+    """
+    Point and panel arrays of the surface lattice ``zeta_surf`` written by :func:`write_zeta_vtk`, with the points and
+    panels ordered with the chordwise index running fastest.
+
+    Single precision output is enough for visualisation, whereas the connectivity is kept as 64 bit integers since
+    that is the VTK id type.
+
+    Returns:
+        tuple: ``coords``, ``point_struct_id`` (``None`` if ``aero2struct_mapping_surf`` is not given),
+        ``point_struct_mag``, ``panel_id``, ``panel_surf_id`` and ``conn``
+    """
+    _, M, N = zeta_surf.shape
+    M -= 1
+    N -= 1
+    point_data_dim = (M + 1) * (N + 1)
+    panel_data_dim = M * N
+
+    if numba_available:
+        coords = np.empty((point_data_dim, 3), dtype=np.float32)
+        point_struct_mag = np.empty((point_data_dim,), dtype=np.float32)
+        panel_id = np.empty((panel_data_dim,), dtype=np.int32)
+        panel_surf_id = np.empty((panel_data_dim,), dtype=np.int32)
+        conn = np.empty((panel_data_dim, 4), dtype=np.int64)
+        if aero2struct_mapping_surf is not None:
+            struct_id_surf = np.asarray(aero2struct_mapping_surf[:N + 1], dtype=np.int32)
+            point_struct_id = np.empty((point_data_dim,), dtype=np.int32)
+        else:
+            struct_id_surf = np.zeros((0,), dtype=np.int32)
+            point_struct_id = np.zeros((0,), dtype=np.int32)
+        _fill_zeta_vtk_arrays(np.ascontiguousarray(zeta_surf, dtype=np.float64),
+                              np.ascontiguousarray(zeta_ref_surf, dtype=np.float64),
+                              struct_id_surf, i_surf,
+                              coords, point_struct_id, point_struct_mag, panel_id, panel_surf_id, conn)
+        if aero2struct_mapping_surf is None:
+            point_struct_id = None
+        return coords, point_struct_id, point_struct_mag, panel_id, panel_surf_id, conn
+
+    # point data
+    coords = np.empty((N + 1, M + 1, 3), dtype=np.float32)
+    coords[:] = zeta_surf.transpose((2, 1, 0))
+    coords = coords.reshape((point_data_dim, 3))
+    if aero2struct_mapping_surf is not None:
+        # all the points of a spanwise section are linked to the same structural node
+        point_struct_id = np.repeat(np.asarray(aero2struct_mapping_surf[:N + 1], dtype=np.int32), M + 1)
+    else:
+        point_struct_id = None
+    # displacement magnitude, with the squared components summed straight into the point ordering
+    diff = zeta_surf - zeta_ref_surf
+    point_struct_mag = np.sqrt(np.einsum('imn,imn->nm', diff, diff), dtype=np.float32).reshape((point_data_dim,))
+
+    # cell data
+    panel_id = np.arange(panel_data_dim, dtype=np.int32)
+    panel_surf_id = np.full((panel_data_dim,), i_surf, dtype=np.int32)
+    i_n, i_m = np.mgrid[0:N, 0:M]
+    first_corner = (i_n * (M + 1) + i_m).reshape((panel_data_dim, 1))
+    conn = first_corner + np.array([0, 1, M + 2, M + 1], dtype=np.int64)
+
+    return coords, point_struct_id, point_struct_mag, panel_id, panel_surf_id, conn
+
+
+if numba_available:
+    @njit(cache=True, parallel=True)
+    def _fill_zeta_vtk_arrays(zeta_surf, zeta_ref_surf, struct_id_surf, i_surf,
+                              coords, point_struct_id, point_struct_mag, panel_id, panel_surf_id, conn):
+        """
+        Compiled counterpart of :func:`_zeta_vtk_arrays` that fills the preallocated output arrays in a single pass
+        over the lattice, parallel across the spanwise sections. ``point_struct_id`` is only filled if
+        ``struct_id_surf`` is not empty.
+        """
+        M = zeta_surf.shape[1] - 1
+        N = zeta_surf.shape[2] - 1
+        with_struct_id = struct_id_surf.shape[0] > 0
+
+        for i_n in prange(N + 1):
+            for i_m in range(M + 1):
+                i_point = i_n * (M + 1) + i_m
+                mag2 = 0.
+                for i_dim in range(3):
+                    coords[i_point, i_dim] = zeta_surf[i_dim, i_m, i_n]
+                    delta = zeta_surf[i_dim, i_m, i_n] - zeta_ref_surf[i_dim, i_m, i_n]
+                    mag2 += delta * delta
+                point_struct_mag[i_point] = np.sqrt(mag2)
+                if with_struct_id:
+                    point_struct_id[i_point] = struct_id_surf[i_n]
+
+                if i_n < N and i_m < M:
+                    i_panel = i_n * M + i_m
+                    panel_id[i_panel] = i_panel
+                    panel_surf_id[i_panel] = i_surf
+                    conn[i_panel, 0] = i_point
+                    conn[i_panel, 1] = i_point + 1
+                    conn[i_panel, 2] = i_point + M + 2
+                    conn[i_panel, 3] = i_point + M + 1
+
+
+def write_zeta_vtk(zeta, zeta_ref, filename_root, aero2struct_mapping=None):
     '''
     Given a list of arrays representing the coordinates of a set of n_surf UVLM
     lattices and organised as:
@@ -189,6 +399,8 @@ def write_zeta_vtk(zeta, zeta_ref, filename_root):
         - zeta_ref: reference lattice used to compute the magnitude of displacements
         - filename_root: initial part of filename (full path) without file
         extension (.vtk)
+        - aero2struct_mapping: if given, the structural node of each spanwise
+        section, used to write the structural node id of each point
     '''
 
     # from IPython import embed
@@ -196,51 +408,10 @@ def write_zeta_vtk(zeta, zeta_ref, filename_root):
     for i_surf in range(len(zeta)):
 
         filename = filename_root + "_%02u.vtu" % (i_surf,)
-        _, M, N = zeta[i_surf].shape
-
-        M -= 1
-        N -= 1
-        point_data_dim = (M + 1) * (N + 1)
-        panel_data_dim = M * N
-
-        coords = np.zeros((point_data_dim, 3))
-        conn = []
-        panel_id = np.zeros((panel_data_dim,), dtype=int)
-        panel_surf_id = np.zeros((panel_data_dim,), dtype=int)
-        point_struct_id = np.zeros((point_data_dim,), dtype=int)
-        point_struct_mag = np.zeros((point_data_dim,), dtype=float)
-
-        counter = -1
-        # coordinates of corners
-        for i_n in range(N + 1):
-            for i_m in range(M + 1):
-                counter += 1
-                coords[counter, :] = zeta[i_surf][:, i_m, i_n]
 
-        counter = -1
-        node_counter = -1
-        for i_n in range(N + 1):
-            # global_counter = aero.aero2struct_mapping[i_surf][i_n]
-            for i_m in range(M + 1):
-                node_counter += 1
-                # point data
-                # point_struct_id[node_counter]=global_counter
-                point_struct_mag[node_counter] = \
-                    np.linalg.norm(zeta[i_surf][:, i_m, i_n] \
-                                   - zeta_ref[i_surf][:, i_m, i_n])
-
-                if i_n < N and i_m < M:
-                    counter += 1
-                else:
-                    continue
-
-                conn.append([node_counter + 0,
-                             node_counter + 1,
-                             node_counter + M + 2,
-                             node_counter + M + 1])
-                # cell data
-                panel_id[counter] = counter
-                panel_surf_id[counter] = i_surf
+        coords, point_struct_id, point_struct_mag, panel_id, panel_surf_id, conn = \
+            _zeta_vtk_arrays(zeta[i_surf], zeta_ref[i_surf], i_surf,
+                             None if aero2struct_mapping is None else aero2struct_mapping[i_surf])
 
         ug = tvtk.UnstructuredGrid(points=coords)
         ug.set_cells(tvtk.Quad().cell_type, conn)
@@ -249,12 +420,15 @@ def write_zeta_vtk(zeta, zeta_ref, filename_root):
         ug.cell_data.add_array(panel_surf_id)
         ug.cell_data.get_array(1).name = 'panel_surface_id'
 
-        ug.point_data.scalars = np.arange(0, coords.shape[0])
+        ug.point_data.scalars = _cached_arange(coords.shape[0])
         ug.point_data.scalars.name = 'n_id'
-        # ug.point_data.add_array(point_struct_id)
-        # ug.point_data.get_array(1).name = 'point_struct_id'
+        i_array = 1
+        if aero2struct_mapping is not None:
+            ug.point_data.add_array(point_struct_id)
+            ug.point_data.get_array(i_array).name = 'point_struct_id'
+            i_array += 1
         ug.point_data.add_array(point_struct_mag)
-        ug.point_data.get_array(1).name = 'point_displacement_magnitude'
+        ug.point_data.get_array(i_array).name = 'point_displacement_magnitude'
 
         write_data(ug, filename)
 
@@ -283,11 +457,27 @@ def write_modes_vtk(data, eigenvectors, NumLambda, filename_root,
     else:
         num_rigid_body = 0
 
-    for mode in range(num_rigid_body, NumLambda - num_rigid_body):
+    def mode_zeta(mode):
         # scale eigenvector
         eigvec = eigenvectors[:num_dof, mode]
         fact = scale_mode(data, eigvec, rot_max_deg, perc_max)
         eigvec = eigvec * fact
-        zeta_mode = get_mode_zeta(data, eigvec)
-        write_zeta_vtk(zeta_mode, tsaero.zeta, filename_root + "_%06u" % (mode,))
-
+        return get_mode_zeta(data, eigvec)
+
+    def write_mode(mode, zeta_mode):
+        write_zeta_vtk(zeta_mode, tsaero.zeta, filename_root + "_%06u" % (mode,), aero.aero2struct_mapping)
+
+    modes = range(num_rigid_body, NumLambda - num_rigid_body)
+    processes = min(os.cpu_count() or 1, 8, len(modes))
+    if numba_available and np.isrealobj(eigenvectors) and processes > 1:
+        # the displaced grids are computed concurrently, since the compiled kernel releases the GIL, whereas the
+        # files are written in order from this thread since tvtk is not thread safe. The modes are processed in
+        # batches to bound the number of displaced grids held in memory
+        with ThreadPool(processes) as pool:
+            for i_batch in range(0, len(modes), processes):
+                batch = modes[i_batch:i_batch + processes]
+                for mode, zeta_mode in zip(batch, pool.map(mode_zeta, batch)):
+                    write_mode(mode, zeta_mode)
+    else:
+        for mode in modes:
+            write_mode(mode, mode_zeta(mode))
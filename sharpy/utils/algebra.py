@@ -542,6 +542,54 @@ def crv2rotation(psi):
     return rot_matrix
 
 
+def crv2rotation_batch(psi):
+    r"""
+    Vectorised version of :func:`crv2rotation` for a set of Cartesian rotation vectors.
+
+    The rotation matrices are built at once from
+
+    .. math::
+        \mathbf{R} = \mathbf{I} + \frac{\sin||\boldsymbol{\Psi}||}{||\boldsymbol{\Psi}||} \tilde{\boldsymbol{\Psi}} +
+        \frac{1-\cos{||\boldsymbol{\Psi}||}}{||\boldsymbol{\Psi}||^2}\tilde{\boldsymbol{\Psi}} \tilde{\boldsymbol{\Psi}}
+
+    where :math:`\tilde{\boldsymbol{\Psi}}\tilde{\boldsymbol{\Psi}} = \boldsymbol{\Psi}\boldsymbol{\Psi}^\top -
+    ||\boldsymbol{\Psi}||^2\mathbf{I}`, using the same series expansion as :func:`crv2rotation` when
+    :math:`||\boldsymbol{\Psi}||=0`.
+
+    Args:
+        psi (np.array): ``(n, 3)`` array of Cartesian rotation vectors.
+
+    Returns:
+        np.array: ``(n, 3, 3)`` array of rotation matrices.
+    """
+
+    psi = np.asarray(psi, dtype=float).reshape((-1, 3))
+    n_psi = psi.shape[0]
+
+    norm2 = np.einsum('ij,ij->i', psi, psi)
+    norm_psi = np.sqrt(norm2)
+    small = norm_psi < 1e-15
+    norm_safe = np.where(small, 1.0, norm_psi)
+    fact_skew = np.where(small, 1.0, np.sin(norm_psi)/norm_safe)
+    fact_skew2 = np.where(small, 0.5, (1.0 - np.cos(norm_psi))/norm_safe**2)
+
+    skew_psi = np.zeros((n_psi, 3, 3))
+    skew_psi[:, 0, 1] = -psi[:, 2]
+    skew_psi[:, 0, 2] = psi[:, 1]
+    skew_psi[:, 1, 0] = psi[:, 2]
+    skew_psi[:, 1, 2] = -psi[:, 0]
+    skew_psi[:, 2, 0] = -psi[:, 1]
+    skew_psi[:, 2, 1] = psi[:, 0]
+
+    skew_psi2 = np.einsum('ij,ik->ijk', psi, psi)
+    skew_psi2[:, [0, 1, 2], [0, 1, 2]] -= norm2[:, None]
+
+    rot_matrix = fact_skew[:, None, None]*skew_psi + fact_skew2[:, None, None]*skew_psi2
+    rot_matrix[:, [0, 1, 2], [0, 1, 2]] += 1.0
+
+    return rot_matrix
+
+
 def rotation2crv(Cab):
     r"""
     Given a rotation matrix :math:`C^{AB}` rotating the frame A onto B, the function returns
@@ -0,0 +1,199 @@
+import numpy as np
+import scipy.linalg as sclalg
+import scipy.sparse.linalg as scsplalg
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from sharpy.postproc.asymptoticstability import AsymptoticStability
+
+
+class StateSpace(object):
+    def __init__(self, A, dt=None):
+        self.A = A
+        self.dt = dt
+
+
+class TestAsymptoticStabilityEigenvalues(unittest.TestCase):
+    """
+    Tests the eigenvalue solvers of the ``AsymptoticStability`` post-processor against the dense solution
+    """
+
+    num_states = 80
+    # for this matrix, the 9th eigenvalue with largest magnitude (and real part) belongs to a complex conjugate pair,
+    # which is split by the Arnoldi solver
+    num_evals = 9
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.A = rng.standard_normal((self.num_states, self.num_states)) / np.sqrt(self.num_states)
+        self.eigenvalues_ref = sclalg.eigvals(self.A)
+
+    def stability(self, eigensolver):
+        stability = AsymptoticStability()
+        stability.settings = {'eigensolver': eigensolver}
+        stability.num_evals = self.num_evals
+        return stability
+
+    def check_eigenpairs(self, eigenvalues, eigenvectors):
+        self.assertTrue(eigenvectors.flags.f_contiguous, msg='Eigenvectors not in Fortran order')
+        np.testing.assert_array_almost_equal(self.A.dot(eigenvectors), eigenvectors * eigenvalues, decimal=10,
+                                             err_msg='Eigenvectors do not correspond to the eigenvalues')
+        for eigenvalue in eigenvalues:
+            self.assertAlmostEqual(np.min(np.abs(self.eigenvalues_ref - eigenvalue)), 0., 10,
+                                   msg='Eigenvalue %s not in the dense solution' % eigenvalue)
+            self.assertAlmostEqual(np.min(np.abs(eigenvalues - eigenvalue.conj())), 0., 10,
+                                   msg='Conjugate of eigenvalue %s missing' % eigenvalue)
+
+    def test_dense(self):
+        eigenvalues, eigenvectors = self.stability('dense').compute_eigenvalues(StateSpace(self.A, 0.1))
+
+        self.assertEqual(len(eigenvalues), self.num_states)
+        self.check_eigenpairs(eigenvalues, eigenvectors)
+
+    def test_arnoldi(self):
+        for dt, criterion in ((0.1, np.abs), (None, np.real)):
+            with self.subTest(dt=dt):
+                eigenvalues, eigenvectors = self.stability('arnoldi').compute_eigenvalues(StateSpace(self.A, dt))
+
+                self.assertEqual(len(eigenvalues), self.num_evals + 1, msg='Split conjugate pair not completed')
+                self.check_eigenpairs(eigenvalues, eigenvectors)
+
+                # the eigenvalues with largest magnitude (DT) or real part (CT) are retained
+                reference = np.sort(criterion(self.eigenvalues_ref))[::-1][:self.num_evals]
+                np.testing.assert_array_almost_equal(np.sort(criterion(eigenvalues))[::-1][:self.num_evals],
+                                                     reference, decimal=10)
+
+    def test_arnoldi_not_converged(self):
+        with mock.patch.object(scsplalg, 'eigs',
+                               side_effect=scsplalg.ArpackNoConvergence('No convergence', None, None)):
+            eigenvalues, eigenvectors = self.stability('arnoldi').compute_eigenvalues(StateSpace(self.A, 0.1))
+
+        self.assertEqual(len(eigenvalues), self.num_states)
+        self.check_eigenpairs(eigenvalues, eigenvectors)
+
+    def test_complete_conjugate_pairs(self):
+        eigenvalues, eigenvectors = sclalg.eig(self.A)
+        complex_evals = np.where(eigenvalues.imag > 1e-6)[0]
+
+        # split a conjugate pair: keep one real eigenvalue and a single eigenvalue of a complex pair
+        real_evals = np.where(eigenvalues.imag == 0.)[0]
+        retained = [real_evals[0], complex_evals[0]]
+        completed_eigenvalues, completed_eigenvectors = \
+            AsymptoticStability.complete_conjugate_pairs(eigenvalues[retained], eigenvectors[:, retained])
+
+        np.testing.assert_array_equal(completed_eigenvalues, np.append(eigenvalues[retained],
+                                                                       eigenvalues[complex_evals[0]].conj()))
+        np.testing.assert_array_equal(completed_eigenvectors[:, -1], eigenvectors[:, complex_evals[0]].conj())
+        np.testing.assert_array_almost_equal(self.A.dot(completed_eigenvectors),
+                                             completed_eigenvectors * completed_eigenvalues, decimal=10)
+
+        # complete pairs are not modified
+        completed_eigenvalues, _ = AsymptoticStability.complete_conjugate_pairs(eigenvalues, eigenvectors)
+        np.testing.assert_array_equal(completed_eigenvalues, eigenvalues)
+
+
+class TestAsymptoticStabilitySorting(unittest.TestCase):
+    """
+    Tests the conversion to continuous time and sorting of the eigenvalues of a singular discrete-time system
+    """
+
+    num_states = 40
+    num_zero_states = 4
+    dt = 0.1
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        # decoupled states with zero DT eigenvalues
+        self.A = rng.standard_normal((self.num_states, self.num_states)) / np.sqrt(self.num_states)
+        self.A[:self.num_zero_states, :] = 0.
+        self.A[:, :self.num_zero_states] = 0.
+
+        stability = AsymptoticStability()
+        stability.settings = {'eigensolver': 'dense'}
+        stability.num_evals = self.num_states
+        self.eigenvalues, self.eigenvectors = stability.compute_eigenvalues(StateSpace(self.A, self.dt))
+
+    def test_continuous_time_eigenvalues(self):
+        with np.errstate(all='raise'):
+            eigenvalues = AsymptoticStability.continuous_time_eigenvalues(self.eigenvalues, self.dt)
+
+        zero = self.eigenvalues == 0.
+        self.assertEqual(np.sum(zero), self.num_zero_states)
+        np.testing.assert_array_equal(eigenvalues[zero], -np.inf)
+        np.testing.assert_array_almost_equal(np.exp(eigenvalues[~zero] * self.dt), self.eigenvalues[~zero],
+                                             decimal=12)
+
+    def test_sort_eigenvalues(self):
+        eigenvalues = AsymptoticStability.continuous_time_eigenvalues(self.eigenvalues, self.dt)
+
+        for frequency_cutoff in (0, 10.):
+            with self.subTest(frequency_cutoff=frequency_cutoff):
+                sorted_eigenvalues, sorted_eigenvectors = \
+                    AsymptoticStability.sort_eigenvalues(eigenvalues, self.eigenvectors, frequency_cutoff)
+
+                # non-finite eigenvalues dropped
+                self.assertTrue(np.all(np.isfinite(sorted_eigenvalues)))
+                if frequency_cutoff == 0:
+                    self.assertEqual(len(sorted_eigenvalues), self.num_states - self.num_zero_states)
+                else:
+                    self.assertTrue(np.all(np.abs(sorted_eigenvalues.imag) <= frequency_cutoff))
+                self.assertTrue(np.all(np.diff(sorted_eigenvalues.real) <= 0.))
+
+                # eigenvectors aligned with the eigenvalues
+                self.assertEqual(sorted_eigenvectors.shape, (self.num_states, len(sorted_eigenvalues)))
+                np.testing.assert_array_almost_equal(self.A.dot(sorted_eigenvectors),
+                                                     sorted_eigenvectors * np.exp(sorted_eigenvalues * self.dt),
+                                                     decimal=10)
+
+                # eigenvalues only
+                sorted_eigenvalues_only, no_eigenvectors = \
+                    AsymptoticStability.sort_eigenvalues(eigenvalues, None, frequency_cutoff)
+                self.assertIsNone(no_eigenvectors)
+                np.testing.assert_array_equal(sorted_eigenvalues_only, sorted_eigenvalues)
+
+
+class TestAsymptoticStabilityExport(unittest.TestCase):
+    """
+    Tests the eigenvalue and eigenvector files exported by the ``AsymptoticStability`` post-processor
+    """
+
+    num_evals = 5
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.stability = AsymptoticStability()
+        self.stability.eigenvalues = rng.standard_normal(8) + 1j * rng.standard_normal(8)
+        self.stability.eigenvectors = np.asfortranarray(rng.standard_normal((12, 8)) +
+                                                        1j * rng.standard_normal((12, 8)))
+        self.stability.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.stability.folder)
+
+    def test_export_npy(self):
+        self.stability.settings = {'export_format': 'npy'}
+        self.stability.export_eigenvalues(self.num_evals)
+
+        self.assertEqual(sorted(os.listdir(self.stability.folder)), ['eigenvalues.npy', 'eigenvectors.npy'])
+        np.testing.assert_array_equal(np.load(self.stability.folder + '/eigenvalues.npy'),
+                                      self.stability.eigenvalues[:self.num_evals])
+        np.testing.assert_array_equal(np.load(self.stability.folder + '/eigenvectors.npy'),
+                                      self.stability.eigenvectors[:, :self.num_evals])
+
+    def test_export_dat(self):
+        self.stability.settings = {'export_format': 'dat'}
+        self.stability.export_eigenvalues(self.num_evals)
+
+        eigenvalues = np.loadtxt(self.stability.folder + '/eigenvalues.dat')
+        eigenvectors = np.loadtxt(self.stability.folder + '/eigenvectors_r.dat') + \
+            1j * np.loadtxt(self.stability.folder + '/eigenvectors_i.dat')
+        np.testing.assert_array_almost_equal(eigenvalues[:, 0] + 1j * eigenvalues[:, 1],
+                                             self.stability.eigenvalues[:self.num_evals], decimal=12)
+        np.testing.assert_array_almost_equal(eigenvectors, self.stability.eigenvectors[:, :self.num_evals],
+                                             decimal=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
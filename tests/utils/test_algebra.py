@@ -574,6 +574,21 @@ class TestAlgebra(unittest.TestCase):
         np.testing.assert_array_almost_equal(Pag_quat.dot(aircraft_nose_rotated), aircraft_nose,
                                              err_msg='Error in projection from A to G using quaternions')
 
+    def test_crv2rotation_batch(self):
+        """
+        Checks the vectorised rotation matrices against ``crv2rotation``, including the zero rotation.
+        """
+
+        psi = np.pi * (2. * np.random.rand(50, 3) - 1)
+        psi[0, :] = 0.
+        psi[1, :] = 1e-16
+
+        rot_batch = algebra.crv2rotation_batch(psi)
+        for i_psi in range(psi.shape[0]):
+            np.testing.assert_array_almost_equal(rot_batch[i_psi], algebra.crv2rotation(psi[i_psi]),
+                                                 decimal=12,
+                                                 err_msg='Error in crv2rotation_batch')
+
 # if __name__=='__main__':
 # unittest.main()
 # # T=TestAlgebra()
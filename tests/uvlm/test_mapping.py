@@ -0,0 +1,105 @@
+import numpy as np
+import unittest
+import sharpy.utils.algebra as algebra
+import sharpy.aero.utils.mapping as mapping
+
+
+def reference_aero2struct_force_mapping(aero_forces, struct2aero_mapping, zeta, pos_def, psi_def, conn, cag):
+    """
+    Node by node loop of the aerodynamic to structural force mapping, used as reference
+    """
+    n_node = pos_def.shape[0]
+    struct_forces = np.zeros((n_node, 6))
+
+    nodes = []
+    for i_elem in range(psi_def.shape[0]):
+        for i_local_node in range(3):
+            i_global_node = conn[i_elem, i_local_node]
+            if i_global_node in nodes:
+                continue
+            nodes.append(i_global_node)
+
+            cbg = np.dot(algebra.crv2rotation(psi_def[i_elem, i_local_node, :]).T, cag)
+            for mapping_here in struct2aero_mapping[i_global_node]:
+                i_surf = mapping_here['i_surf']
+                i_n = mapping_here['i_n']
+                for i_m in range(aero_forces[i_surf].shape[1]):
+                    chi_g = zeta[i_surf][:, i_m, i_n] - np.dot(cag.T, pos_def[i_global_node, :])
+                    struct_forces[i_global_node, 0:3] += np.dot(cbg, aero_forces[i_surf][0:3, i_m, i_n])
+                    struct_forces[i_global_node, 3:6] += np.dot(cbg, aero_forces[i_surf][3:6, i_m, i_n])
+                    struct_forces[i_global_node, 3:6] += np.dot(cbg, np.cross(chi_g,
+                                                                              aero_forces[i_surf][0:3, i_m, i_n]))
+
+    return struct_forces
+
+
+class TestAero2StructForceMapping(unittest.TestCase):
+    """
+    Tests the compiled and NumPy implementations of :func:`sharpy.aero.utils.mapping.aero2struct_force_mapping`
+    against a node by node loop
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+
+        # beam of 3-noded elements
+        n_elem = 6
+        n_node = 2 * n_elem + 1
+        self.conn = np.zeros((n_elem, 3), dtype=int)
+        for i_elem in range(n_elem):
+            self.conn[i_elem, :] = [2 * i_elem, 2 * i_elem + 2, 2 * i_elem + 1]
+        self.pos_def = rng.standard_normal((n_node, 3))
+        self.psi_def = 0.5 * rng.standard_normal((n_elem, 3, 3))
+        self.psi_def[0, 0, :] = 0.
+        self.master = np.zeros((n_node, 2), dtype=int)
+
+        # two surfaces with different chordwise panelling sharing the middle node. The first node has no
+        # aerodynamic sections
+        half = n_node // 2
+        self.struct2aero_mapping = [[] for _ in range(n_node)]
+        for i_node in range(1, half + 1):
+            self.struct2aero_mapping[i_node].append({'i_surf': 0, 'i_n': i_node - 1})
+        for i_node in range(half, n_node):
+            self.struct2aero_mapping[i_node].append({'i_surf': 1, 'i_n': i_node - half})
+        dimensions = [(4, half), (7, n_node - half)]
+        self.aero_forces = [rng.standard_normal((6, M, N)) for M, N in dimensions]
+        self.zeta = [rng.standard_normal((3, M + 1, N)) for M, N in dimensions]
+
+        self.cag = algebra.quat2rotation(algebra.unit_vector(np.array([0.9, 0.1, -0.3, 0.2])))
+
+    def compare(self, cag):
+        reference = reference_aero2struct_force_mapping(self.aero_forces, self.struct2aero_mapping, self.zeta,
+                                                        self.pos_def, self.psi_def, self.conn, cag)
+        struct_forces = mapping.aero2struct_force_mapping(self.aero_forces, self.struct2aero_mapping, self.zeta,
+                                                          self.pos_def, self.psi_def, self.master, self.conn, cag)
+
+        np.testing.assert_array_almost_equal(struct_forces, reference, decimal=12,
+                                             err_msg='Structural forces differ from the reference')
+        np.testing.assert_array_equal(struct_forces[0, :], np.zeros(6),
+                                      err_msg='Node without aerodynamic sections is loaded')
+
+    @unittest.skipUnless(mapping.numba_available, 'Numba not available')
+    def test_compiled(self):
+        self.compare(np.eye(3))
+        self.compare(self.cag)
+
+    def test_numpy(self):
+        numba_available = mapping.numba_available
+        mapping.numba_available = False
+        try:
+            self.compare(np.eye(3))
+            self.compare(self.cag)
+        finally:
+            mapping.numba_available = numba_available
+
+    def test_flatten_struct2aero_mapping(self):
+        n_node = len(self.struct2aero_mapping)
+        node_offsets, surf_idx, n_idx = mapping.flatten_struct2aero_mapping(self.struct2aero_mapping, n_node)
+
+        for i_node in range(n_node):
+            entries = [(surf_idx[k], n_idx[k]) for k in range(node_offsets[i_node], node_offsets[i_node + 1])]
+            self.assertEqual(entries, [(m['i_surf'], m['i_n']) for m in self.struct2aero_mapping[i_node]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import numpy as np
+import scipy.linalg
+import unittest
+from unittest import mock
+from sharpy.solvers.modal import Modal
+
+
+class TestModalEigensolvers(unittest.TestCase):
+    """
+    Compares the LOBPCG eigensolver of the Modal solver against the dense LAPACK solution for a banded
+    generalised symmetric eigenvalue problem, and checks the choice of solver for the undamped modes
+    """
+
+    num_dof = 300
+    num_modes = 10
+
+    def setUp(self):
+        n = self.num_dof
+        # pentadiagonal, positive definite stiffness matrix and tridiagonal mass matrix
+        self.K = 2.01*np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1) + 0.5*(np.eye(n, k=2) + np.eye(n, k=-2))
+        self.M = np.diag(1. + 0.5*np.sin(np.arange(n))) + 0.1*(np.eye(n, k=1) + np.eye(n, k=-1))
+
+    def test_lobpcg_modes(self):
+        eigenvalues, eigenvectors = Modal.lobpcg_modes(self.K, self.M, self.num_modes)
+        eigenvalues_ref, eigenvectors_ref = scipy.linalg.eigh(self.K, self.M)
+        eigenvalues_ref = eigenvalues_ref[:self.num_modes]
+        eigenvectors_ref = eigenvectors_ref[:, :self.num_modes]
+
+        np.testing.assert_allclose(eigenvalues, eigenvalues_ref, rtol=1e-14, atol=0,
+                                   err_msg='LOBPCG eigenvalues differ from the dense solution')
+
+        # M-orthonormal modes
+        np.testing.assert_array_almost_equal(eigenvectors.T.dot(self.M.dot(eigenvectors)), np.eye(self.num_modes),
+                                             decimal=13,
+                                             err_msg='LOBPCG modes are not M-orthonormal')
+
+        # same modes up to the sign
+        np.testing.assert_array_almost_equal(np.abs(np.einsum('ij,ij->j', eigenvectors,
+                                                              self.M.dot(eigenvectors_ref))),
+                                             np.ones(self.num_modes),
+                                             decimal=12,
+                                             err_msg='LOBPCG modes differ from the dense solution')
+
+    def test_lobpcg_modes_fallback(self):
+        # not positive definite: falls back to the dense solver
+        K = self.K.copy()
+        K[0, 0] = -5.
+        eigenvalues, _ = Modal.lobpcg_modes(K, self.M, self.num_modes)
+        eigenvalues_ref, _ = Modal.dense_modes(K, self.M, self.num_modes)
+
+        np.testing.assert_array_equal(eigenvalues, eigenvalues_ref)
+
+    def test_lobpcg_modes_not_converged(self):
+        # too few iterations: falls back to the dense solver
+        eigenvalues, eigenvectors = Modal.lobpcg_modes(self.K, self.M, self.num_modes, maxiter=2)
+        eigenvalues_ref, eigenvectors_ref = Modal.dense_modes(self.K, self.M, self.num_modes)
+
+        np.testing.assert_array_equal(eigenvalues, eigenvalues_ref)
+        np.testing.assert_array_equal(eigenvectors, eigenvectors_ref)
+
+    def undamped_modes(self, K):
+        modal = Modal()
+        modal.settings = {'eigensolver': 'dense'}
+        modal.rigid_body_motion = False
+        with mock.patch.object(Modal, 'dense_modes', wraps=Modal.dense_modes) as dense_modes:
+            eigenvalues, eigenvectors, freq_natural = modal.undamped_modes(K, self.M, self.num_modes)
+        return eigenvalues, eigenvectors, freq_natural, dense_modes.called
+
+    def test_undamped_modes_symmetric(self):
+        # symmetric to round-off, scaled to typical stiffness values
+        K = 1e6 * self.K
+        K[1, 0] += 1e-14 * K[1, 0]
+        eigenvalues, _, freq_natural, symmetric_solver = self.undamped_modes(K)
+
+        self.assertTrue(symmetric_solver, msg='Symmetric solver not used for a symmetric stiffness matrix')
+        np.testing.assert_array_almost_equal(freq_natural, np.sqrt(eigenvalues), decimal=12)
+
+    def test_undamped_modes_nonsymmetric(self):
+        # slightly non-symmetric stiffness matrix, which np.allclose would take as symmetric
+        K = 1e6 * self.K
+        K[1, 0] += 1e-6 * K[1, 0]
+        self.assertTrue(np.allclose(K, K.T))
+        eigenvalues, eigenvectors, freq_natural, symmetric_solver = self.undamped_modes(K)
+
+        self.assertFalse(symmetric_solver, msg='Symmetric solver used for a non-symmetric stiffness matrix')
+        eigenvalues_ref = np.sort(scipy.linalg.eigvals(K, self.M).real)[:self.num_modes]
+        np.testing.assert_allclose(eigenvalues, eigenvalues_ref, rtol=1e-10)
+        np.testing.assert_allclose(K.dot(eigenvectors), self.M.dot(eigenvectors) * eigenvalues,
+                                   rtol=0, atol=1e-8 * np.abs(K).max())
+
+
+if __name__ == '__main__':
+    unittest.main()
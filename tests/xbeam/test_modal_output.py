@@ -0,0 +1,62 @@
+import numpy as np
+import os
+import shutil
+import tempfile
+import unittest
+from sharpy.solvers.modal import Modal
+
+
+class Namespace(object):
+    pass
+
+
+class TestModalOutput(unittest.TestCase):
+    """
+    Tests the modal output files written by the Modal solver
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.eigenvalues = rng.standard_normal(6) + 1j * rng.standard_normal(6)
+        self.eigenvectors = rng.standard_normal((12, 6)) + 1j * rng.standard_normal((12, 6))
+        self.frequencies = rng.random(6)
+        self.damping = rng.random(6)
+
+        # the output folder name contains the text file extension
+        self.tempdir = tempfile.mkdtemp(suffix='.dat')
+
+        self.modal = Modal()
+        self.modal.data = Namespace()
+        self.modal.data.ts = 3
+        self.modal.folder = self.tempdir + '/beam_modal_analysis/'
+        os.makedirs(self.modal.folder)
+        self.modal.filename_damp = self.modal.folder + 'tstep000003_ModalDamping.dat'
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_write_npy(self):
+        self.modal.settings = {'output_format': 'npy'}
+        self.modal.write_dat_files(self.eigenvalues, self.eigenvectors, self.frequencies, self.damping)
+
+        self.assertEqual(sorted(os.listdir(self.modal.folder)),
+                         ['eigenvalues.npy', 'eigenvectors.npy', 'frequencies.npy', 'tstep000003_ModalDamping.npy'])
+        np.testing.assert_array_equal(np.load(self.modal.folder + 'eigenvalues.npy'), self.eigenvalues)
+        np.testing.assert_array_equal(np.load(self.modal.folder + 'eigenvectors.npy'), self.eigenvectors.real)
+        np.testing.assert_array_equal(np.load(self.modal.folder + 'frequencies.npy'), self.frequencies)
+        np.testing.assert_array_equal(np.load(self.modal.folder + 'tstep000003_ModalDamping.npy'), self.damping)
+
+    def test_write_dat(self):
+        self.modal.settings = {'output_format': 'dat'}
+        self.modal.write_dat_files(self.eigenvalues, self.eigenvectors, self.frequencies, self.damping)
+
+        self.assertEqual(sorted(os.listdir(self.modal.folder)),
+                         ['eigenvalues.dat', 'eigenvectors.dat', 'frequencies.dat', 'tstep000003_ModalDamping.dat'])
+        np.testing.assert_array_almost_equal(np.loadtxt(self.modal.folder + 'eigenvectors.dat'),
+                                             self.eigenvectors.real, decimal=12)
+        np.testing.assert_allclose(np.loadtxt(self.modal.folder + 'frequencies.dat'), self.frequencies, rtol=1e-6)
+        np.testing.assert_allclose(np.loadtxt(self.modal.filename_damp), self.damping, rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
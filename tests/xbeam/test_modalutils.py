@@ -0,0 +1,175 @@
+import numpy as np
+import unittest
+import sharpy.utils.algebra as algebra
+import sharpy.structure.utils.modalutils as modalutils
+
+
+class Namespace(object):
+    pass
+
+
+def reference_mode_zeta(data, eigvect):
+    """
+    Node by node loop retrieving the UVLM grid displaced by the eigenvector ``eigvect``, used as reference
+    """
+    struct = data.structure
+    tsstr = struct.timestep_info[data.ts]
+    zeta = data.aero.timestep_info[data.ts].zeta
+    zeta_mode = [zeta_surf.copy() for zeta_surf in zeta]
+
+    Cga0 = algebra.quat2rotation(tsstr.quat)
+    jj = 0
+    for node_glob in range(struct.num_node):
+        if struct.boundary_conditions[node_glob] == 1:
+            continue
+        ee, node_loc = struct.node_master_elem[node_glob, :]
+
+        Rg0 = np.dot(Cga0, tsstr.pos[node_glob, :])
+        Cbg0 = np.dot(algebra.crv2rotation(tsstr.psi[ee, node_loc, :]).T, Cga0.T)
+        Rg = np.dot(Cga0, tsstr.pos[node_glob, :] + eigvect[jj:jj + 3])
+        Cgb = np.dot(Cga0, algebra.crv2rotation(tsstr.psi[ee, node_loc, :] + eigvect[jj + 3:jj + 6]))
+        jj += 6
+
+        for mapping_here in data.aero.struct2aero_mapping[node_glob]:
+            ss = mapping_here['i_surf']
+            nn = mapping_here['i_n']
+            for mm in range(zeta[ss].shape[1]):
+                zeta_mode[ss][:, mm, nn] = Rg + np.dot(Cgb, np.dot(Cbg0, zeta[ss][:, mm, nn] - Rg0))
+
+    return zeta_mode
+
+
+def reference_zeta_vtk_arrays(zeta_surf, zeta_ref_surf, i_surf, aero2struct_mapping_surf):
+    """
+    Point by point loop building the VTK arrays of a surface lattice, used as reference
+    """
+    _, M, N = zeta_surf.shape
+    M -= 1
+    N -= 1
+    coords = np.zeros(((M + 1) * (N + 1), 3))
+    point_struct_id = np.zeros(((M + 1) * (N + 1),), dtype=int)
+    point_struct_mag = np.zeros(((M + 1) * (N + 1),))
+    conn = np.zeros((M * N, 4), dtype=int)
+    counter = -1
+    for i_n in range(N + 1):
+        for i_m in range(M + 1):
+            counter += 1
+            coords[counter, :] = zeta_surf[:, i_m, i_n]
+            point_struct_id[counter] = aero2struct_mapping_surf[i_n]
+            point_struct_mag[counter] = np.linalg.norm(zeta_surf[:, i_m, i_n] - zeta_ref_surf[:, i_m, i_n])
+            if i_n < N and i_m < M:
+                conn[i_n * M + i_m, :] = [counter, counter + 1, counter + M + 2, counter + M + 1]
+
+    return coords, point_struct_id, point_struct_mag, np.arange(M * N), np.full((M * N,), i_surf), conn
+
+
+class TestModalUtils(unittest.TestCase):
+    """
+    Tests the modal utilities. The compiled and NumPy implementations of the mode shape lattice displacement and VTK
+    arrays are compared against simple loops
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+
+        n_elem = 5
+        n_node = 2 * n_elem + 1
+
+        data = Namespace()
+        data.ts = 0
+        data.structure = Namespace()
+        data.structure.num_node = n_node
+        data.structure.boundary_conditions = np.zeros((n_node,), dtype=int)
+        data.structure.boundary_conditions[0] = 1
+        data.structure.boundary_conditions[-1] = -1
+        data.structure.num_dof = 6 * (n_node - 1)
+        data.structure.node_master_elem = np.zeros((n_node, 2), dtype=int)
+        for i_node in range(n_node):
+            data.structure.node_master_elem[i_node, :] = [min(i_node // 2, n_elem - 1),
+                                                          0 if i_node == 0 else 2 - i_node % 2]
+        tsstr = Namespace()
+        tsstr.pos = rng.standard_normal((n_node, 3))
+        tsstr.psi = 0.3 * rng.standard_normal((n_elem, 3, 3))
+        tsstr.quat = algebra.unit_vector(np.array([0.9, 0.1, 0.2, -0.3]))
+        data.structure.timestep_info = [tsstr]
+
+        # two surfaces with different chordwise panelling sharing one node. The last node has no aerodynamic
+        # sections
+        data.aero = Namespace()
+        data.aero.n_surf = 2
+        data.aero.struct2aero_mapping = [[] for _ in range(n_node)]
+        for i_node in range(7):
+            data.aero.struct2aero_mapping[i_node].append({'i_surf': 0, 'i_n': i_node})
+        for i_node in range(6, n_node - 1):
+            data.aero.struct2aero_mapping[i_node].append({'i_surf': 1, 'i_n': i_node - 6})
+        tsaero = Namespace()
+        tsaero.zeta = [rng.standard_normal((3, 5, 7)), rng.standard_normal((3, 3, 4))]
+        data.aero.timestep_info = [tsaero]
+        self.data = data
+
+        self.eigvect = 0.1 * rng.standard_normal((data.structure.num_dof,))
+
+    def compare_mode_zeta(self):
+        reference = reference_mode_zeta(self.data, self.eigvect)
+        zeta_mode = modalutils.get_mode_zeta(self.data, self.eigvect)
+        for i_surf in range(self.data.aero.n_surf):
+            np.testing.assert_array_almost_equal(zeta_mode[i_surf], reference[i_surf], decimal=12,
+                                                 err_msg='Displaced lattice of surface %u differs from the '
+                                                         'reference' % i_surf)
+
+    def compare_zeta_vtk_arrays(self):
+        zeta_ref = self.data.aero.timestep_info[0].zeta
+        zeta = [zeta_surf + 0.1 for zeta_surf in zeta_ref]
+        aero2struct_mapping = [[0, 1, 2, 3, 4, 5, 6], [6, 7, 8, 9]]
+        for i_surf in range(len(zeta)):
+            reference = reference_zeta_vtk_arrays(zeta[i_surf], zeta_ref[i_surf], i_surf,
+                                                  aero2struct_mapping[i_surf])
+            arrays = modalutils._zeta_vtk_arrays(zeta[i_surf], zeta_ref[i_surf], i_surf,
+                                                 aero2struct_mapping[i_surf])
+            for name, array, array_ref in zip(('coords', 'point_struct_id', 'point_struct_mag', 'panel_id',
+                                               'panel_surf_id', 'conn'), arrays, reference):
+                np.testing.assert_array_almost_equal(array, array_ref, decimal=6,
+                                                     err_msg='VTK array %s of surface %u differs from the '
+                                                             'reference' % (name, i_surf))
+
+            self.assertIsNone(modalutils._zeta_vtk_arrays(zeta[i_surf], zeta_ref[i_surf], i_surf)[1])
+
+    @unittest.skipUnless(modalutils.numba_available, 'Numba not available')
+    def test_compiled(self):
+        self.compare_mode_zeta()
+        self.compare_zeta_vtk_arrays()
+
+    def test_numpy(self):
+        numba_available = modalutils.numba_available
+        modalutils.numba_available = False
+        try:
+            self.compare_mode_zeta()
+            self.compare_zeta_vtk_arrays()
+        finally:
+            modalutils.numba_available = numba_available
+
+    def test_frequency_damping(self):
+        """
+        Compares the frequency and damping of an array of eigenvalues against those of each eigenvalue, including
+        real eigenvalues
+        """
+        eigenvalues = np.array([-0.5 + 10j, 0.1 - 3j, -2. + 0j, 0.3 + 0j, -1e-3 + 1e-10j, 0j])
+        result = modalutils.frequency_damping(eigenvalues)
+
+        for i_eval, eigenvalue in enumerate(eigenvalues):
+            reference = modalutils.frequency_damping(eigenvalue)
+            for i_output in range(len(reference)):
+                self.assertEqual(np.shape(reference[i_output]), ())
+                self.assertEqual(result[i_output][i_eval], reference[i_output],
+                                 msg='Output %u of eigenvalue %u differs from the scalar call' % (i_output, i_eval))
+
+        self.assertAlmostEqual(result[2][0], 0.5 / np.abs(eigenvalues[0]), 15)
+        self.assertAlmostEqual(result[5][0], 2 * np.pi / 10., 15)
+
+        # real eigenvalues (damped frequency below 1e-8 Hz)
+        np.testing.assert_array_equal(result[2][2:], np.ones(4))
+        np.testing.assert_array_equal(result[5][2:], np.full(4, np.inf))
+
+
+if __name__ == '__main__':
+    unittest.main()